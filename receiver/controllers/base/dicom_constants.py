@@ -86,6 +86,7 @@ class TransferSyntaxUIDs:
 
     JPEG_BASELINE = '1.2.840.10008.1.2.4.50'
     JPEG_LOSSLESS = '1.2.840.10008.1.2.4.70'
+    JPEG_LS_LOSSLESS = '1.2.840.10008.1.2.4.80'
     JPEG_2000_LOSSLESS = '1.2.840.10008.1.2.4.90'
 
     @classmethod
@@ -94,6 +95,7 @@ class TransferSyntaxUIDs:
         compressed = [
             cls.JPEG_BASELINE,
             cls.JPEG_LOSSLESS,
+            cls.JPEG_LS_LOSSLESS,
             cls.JPEG_2000_LOSSLESS,
         ]
         return uid in compressed
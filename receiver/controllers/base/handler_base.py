@@ -9,15 +9,29 @@ Provides common functionality for all DICOM handlers:
 - Query parameter extraction
 """
 import logging
-from typing import Any, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
 from io import BytesIO
 
 from pydicom import dcmread
+from pydicom.datadict import tag_for_keyword
 from pydicom.uid import ImplicitVRLittleEndian
 
 from .dicom_constants import DICOMStatus
 
+# Tags of the UIDs extracted from every retrieve identifier
+_UID_TAGS = {
+    'StudyInstanceUID': 0x0020000D,
+    'SeriesInstanceUID': 0x0020000E,
+    'SOPInstanceUID': 0x00080018,
+}
+
+# UID prefixes matched against every accepted context, compared by slice
+_DICOM_SOP_CLASS_PREFIX = '1.2.840.10008.5.1.4'
+_QR_SOP_CLASS_PREFIX = '1.2.840.10008.5.1.4.1.2.'
+_DICOM_SOP_CLASS_PREFIX_LEN = len(_DICOM_SOP_CLASS_PREFIX)
+_QR_SOP_CLASS_PREFIX_LEN = len(_QR_SOP_CLASS_PREFIX)
+
 
 class HandlerBase(ABC):
     """
@@ -31,6 +45,9 @@ class HandlerBase(ABC):
     - Status code helpers
     """
 
+    # Identifier elements read by C-GET/C-MOVE, see decode_identifier()
+    RETRIEVE_IDENTIFIER_TAGS = ['QueryRetrieveLevel', 'PatientID', *_UID_TAGS]
+
     def __init__(self, handler_name: str):
         """
         Initialize base handler.
@@ -40,6 +57,22 @@ class HandlerBase(ABC):
         """
         self.handler_name = handler_name
         self.logger = logging.getLogger(f'receiver.handlers.{handler_name}')
+        self._access_control = None
+
+    def get_access_control(self) -> Optional[Any]:
+        """
+        Get the access control service, cached on the handler once available.
+
+        The service is only created after the proxy configuration has been
+        loaded, so a missing service is looked up again on the next call.
+
+        Returns:
+            AccessControlService instance or None if not available
+        """
+        if self._access_control is None:
+            from receiver.services.config import get_access_control_service
+            self._access_control = get_access_control_service()
+        return self._access_control
 
     def check_access(
         self,
@@ -59,14 +92,13 @@ class HandlerBase(ABC):
         try:
             from receiver.services.config import (
                 extract_calling_ae_title,
-                extract_requester_address,
-                get_access_control_service
+                extract_requester_address
             )
 
             calling_ae = extract_calling_ae_title(event)
             requester_ip = extract_requester_address(event)
 
-            access_control = get_access_control_service()
+            access_control = self.get_access_control()
 
             if not access_control:
                 return True, "No access control configured"
@@ -118,20 +150,27 @@ class HandlerBase(ABC):
                 'requester_ip': None
             }
 
-    def decode_identifier(self, identifier: Any) -> Any:
+    def decode_identifier(self, identifier: Any, specific_tags: Optional[List] = None) -> Any:
         """
         Decode identifier if it's a BytesIO object.
 
+        With specific_tags only those elements are parsed, unless debug
+        logging is enabled, in which case the whole identifier is decoded so
+        log_query_parameters can show it.
+
         Args:
             identifier: Query identifier (BytesIO or Dataset)
+            specific_tags: Optional keywords or tags to limit decoding to
 
         Returns:
             Decoded Dataset
         """
         if isinstance(identifier, BytesIO):
             self.logger.debug("Identifier is BytesIO, decoding to Dataset...")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                specific_tags = None
             identifier.seek(0)
-            identifier = dcmread(identifier, force=True)
+            identifier = dcmread(identifier, force=True, specific_tags=specific_tags)
 
         return identifier
 
@@ -147,18 +186,20 @@ class HandlerBase(ABC):
             UID string or None
         """
         try:
-            for elem in identifier:
-                if elem.keyword == uid_type:
-                    if elem.value:
-                        uid = str(elem.value).strip()
-                        self.logger.debug(f"Extracted {uid_type}: {uid}")
-                        return uid
-                    else:
-                        self.logger.warning(f"{uid_type} element exists but value is empty")
-                        return None
-
-            self.logger.warning(f"No {uid_type} element found in identifier")
-            return None
+            tag = _UID_TAGS.get(uid_type) or tag_for_keyword(uid_type)
+            elem = identifier.get(tag) if tag is not None else None
+
+            if elem is None:
+                self.logger.warning(f"No {uid_type} element found in identifier")
+                return None
+
+            if not elem.value:
+                self.logger.warning(f"{uid_type} element exists but value is empty")
+                return None
+
+            uid = str(elem.value).strip()
+            self.logger.debug(f"Extracted {uid_type}: {uid}")
+            return uid
 
         except Exception as e:
             self.logger.error(f"Error extracting {uid_type}: {e}", exc_info=True)
@@ -187,35 +228,49 @@ class HandlerBase(ABC):
             identifier: DICOM identifier Dataset
             max_value_length: Maximum length of value to display
         """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+
         self.logger.debug("Query Parameters:")
         self.logger.debug(f"Identifier type: {type(identifier)}")
 
         try:
             for elem in identifier:
-                if elem.value is not None:
-                    if isinstance(elem.value, (str, int, float)):
-                        value_str = str(elem.value)
-                        display_value = value_str[:max_value_length] + "..." if len(value_str) > max_value_length else value_str
-                    else:
-                        display_value = f"<{type(elem.value).__name__}>"
-                    self.logger.debug(f"  {elem.keyword}: {display_value}")
+                value = elem.value
+                if value is None:
+                    continue
+                if isinstance(value, (str, int, float)):
+                    # %.*s truncates while formatting, without slicing a copy
+                    value_str = str(value)
+                    suffix = "..." if len(value_str) > max_value_length else ""
+                    self.logger.debug("  %s: %.*s%s", elem.keyword, max_value_length, value_str, suffix)
+                else:
+                    self.logger.debug("  %s: <%s>", elem.keyword, type(value).__name__)
         except Exception as e:
             self.logger.warning(f"Error logging query parameters: {e}")
 
-    def configure_association_contexts(self, event: Any) -> None:
+    def configure_association_contexts(self, event: Any) -> Dict[str, set]:
         """
         Configure association contexts for sending data back.
-        Sets all accepted contexts as SCU for C-GET/C-MOVE responses.
+        Sets all accepted contexts as SCU for C-GET/C-MOVE responses and,
+        in the same pass, indexes the accepted transfer syntaxes.
 
         Args:
             event: pynetdicom event
+
+        Returns:
+            Dict of SOP Class UID to set of accepted transfer syntax UIDs
         """
+        accepted: Dict[str, set] = {}
         try:
-            for cx in event.assoc.accepted_contexts:
+            contexts = event.assoc.accepted_contexts
+            for cx in contexts:
                 cx._as_scu = True
-            self.logger.debug(f"Configured {len(event.assoc.accepted_contexts)} contexts as SCU")
+                accepted.setdefault(cx.abstract_syntax, set()).update(cx.transfer_syntax)
+            self.logger.debug(f"Configured {len(contexts)} contexts as SCU")
         except Exception as e:
             self.logger.warning(f"Error configuring association contexts: {e}")
+        return accepted
 
     def get_transfer_syntax(self, event: Any) -> str:
         """
@@ -229,7 +284,7 @@ class HandlerBase(ABC):
         """
         try:
             for cx in event.assoc.accepted_contexts:
-                if cx.abstract_syntax.startswith('1.2.840.10008.5.1.4'):
+                if cx.abstract_syntax[:_DICOM_SOP_CLASS_PREFIX_LEN] == _DICOM_SOP_CLASS_PREFIX:
                     if cx.transfer_syntax:
                         syntax = cx.transfer_syntax[0]
                         self.logger.debug(f"Using transfer syntax: {syntax}")
@@ -258,7 +313,7 @@ class HandlerBase(ABC):
             for cx in event.assoc.accepted_contexts:
                 self.logger.info(f"  Context {cx.context_id}: {cx.abstract_syntax} (SCU:{cx.as_scu}, SCP:{cx.as_scp})")
 
-                if not cx.abstract_syntax.startswith('1.2.840.10008.5.1.4.1.2.'):
+                if cx.abstract_syntax[:_QR_SOP_CLASS_PREFIX_LEN] != _QR_SOP_CLASS_PREFIX:
                     storage_contexts.append(cx.abstract_syntax)
 
             if storage_contexts:
@@ -324,6 +379,23 @@ class HandlerBase(ABC):
         else:
             return DICOMStatus.OUT_OF_RESOURCES_SUB_OPERATIONS
 
+    def release_datasets(self, datasets: Any) -> None:
+        """
+        Release the resources behind a set of retrieved datasets.
+
+        Download streams hold an open archive and its buffer until closed;
+        plain lists have nothing to release.
+
+        Args:
+            datasets: Datasets returned for a retrieve request
+        """
+        close = getattr(datasets, 'close', None)
+        if close:
+            try:
+                close()
+            except Exception as e:
+                self.logger.warning(f"Error releasing datasets: {e}")
+
     @abstractmethod
     def handle(self, event: Any):
         """
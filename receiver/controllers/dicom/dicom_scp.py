@@ -25,7 +25,13 @@ from pynetdicom.sop_class import (
     EnhancedMRImageStorage,
     EnhancedMRColorImageStorage,
 )
-from pydicom.uid import ImplicitVRLittleEndian, ExplicitVRLittleEndian
+from pydicom.uid import (
+    ImplicitVRLittleEndian,
+    ExplicitVRLittleEndian,
+    JPEGLSLossless,
+    JPEG2000Lossless,
+    JPEGLosslessSV1,
+)
 from django.conf import settings
 
 if TYPE_CHECKING:
@@ -272,12 +278,24 @@ class DicomServiceProvider:
             self.ae.dimse_timeout = getattr(settings, 'DICOM_DIMSE_TIMEOUT', 60)
             self.ae.network_timeout = getattr(settings, 'DICOM_NETWORK_TIMEOUT', 60)
 
+            # Compressed syntaxes let C-GET sub-operations pass archived
+            # pixel data through without transcoding. pynetdicom keeps one
+            # context per SOP Class for both roles, so inbound C-STOREs can
+            # negotiate them too. The acceptor's order wins, so native
+            # syntaxes stay first; only lossless ones are offered, and
+            # compressed stores are kept as received
             for context in StoragePresentationContexts:
                 self.ae.add_supported_context(
                     context.abstract_syntax,
                     scu_role=True,
                     scp_role=True,
-                    transfer_syntax=[ImplicitVRLittleEndian, ExplicitVRLittleEndian]
+                    transfer_syntax=[
+                        ImplicitVRLittleEndian,
+                        ExplicitVRLittleEndian,
+                        JPEGLSLossless,
+                        JPEG2000Lossless,
+                        JPEGLosslessSV1,
+                    ]
                 )
 
             for context in StoragePresentationContexts:
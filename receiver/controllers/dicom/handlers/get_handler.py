@@ -2,7 +2,13 @@
 C-GET Handler for DICOM operations.
 Handles C-GET requests to retrieve DICOM studies via same connection (no NAT issues).
 """
-from typing import Any, Optional, TYPE_CHECKING
+import logging
+import queue
+import threading
+from typing import Any, Dict, Iterable, Iterator, Optional, TYPE_CHECKING
+
+from django.db import connection
+from pydicom.uid import ImplicitVRLittleEndian, ExplicitVRLittleEndian
 
 from receiver.controllers.base import HandlerBase, DICOMStatus
 from receiver.controllers.dicom.services import DICOMDownloadService, DICOMDatasetService
@@ -24,6 +30,17 @@ class GetHandler(HandlerBase):
     - Simpler network setup
     """
 
+    # Fallback order when the archived transfer syntax was not accepted.
+    # Only uncompressed syntaxes: pydicom cannot encode JPEG family data.
+    FALLBACK_TRANSFER_SYNTAXES = (
+        ExplicitVRLittleEndian,
+        ImplicitVRLittleEndian,
+    )
+
+    # Datasets loaded ahead of the send loop; bounds memory while the
+    # next files are parsed during the network round trip of the current one.
+    PREFETCH_QUEUE_SIZE = 4
+
     def __init__(
         self,
         storage_manager: 'StorageManager',
@@ -45,6 +62,16 @@ class GetHandler(HandlerBase):
         self.dataset_service = DICOMDatasetService()
         self.download_service: Optional[DICOMDownloadService] = None
 
+        # Built here so the first retrieve does not pay for it
+        if api_query_service is not None:
+            from receiver.services.coordination import get_dispatch_lock_manager
+
+            self.download_service = DICOMDownloadService(
+                api_client=api_query_service.api_client,
+                resolver=resolver,
+                lock_manager=get_dispatch_lock_manager()
+            )
+
     def handle_get(self, event: Any):
         """
         Handle C-GET request.
@@ -70,7 +97,10 @@ class GetHandler(HandlerBase):
                 return
 
             request = event.request
-            identifier = self.decode_identifier(request.Identifier)
+            identifier = self.decode_identifier(
+                request.Identifier,
+                specific_tags=self.RETRIEVE_IDENTIFIER_TAGS
+            )
             query_level = self.get_query_level(identifier)
             study_uid = self.extract_uid(identifier, 'StudyInstanceUID')
 
@@ -81,50 +111,60 @@ class GetHandler(HandlerBase):
 
             self.log_query_parameters(identifier)
 
-            for cx in event.assoc.accepted_contexts:
-                cx._as_scu = True
-            self.logger.debug(f"Configured {len(event.assoc.accepted_contexts)} contexts as SCU")
+            accepted_syntaxes = self.configure_association_contexts(event)
 
             storage_contexts = self.log_association_contexts(event)
-            transfer_syntax = self.get_transfer_syntax(event)
 
-            datasets = self._find_datasets(identifier, query_level, study_uid, transfer_syntax)
+            datasets = self._find_datasets(identifier, query_level, study_uid)
 
-            if not datasets:
-                self.logger.warning("No matching files found for C-GET request")
-                yield DICOMStatus.OUT_OF_RESOURCES_SUB_OPERATIONS
-                return
-
-            total_datasets = len(datasets)
-            self.logger.info(f"Found {total_datasets} datasets to retrieve")
-
-            yield total_datasets
-
-            sent_count = 0
-            failed_count = 0
-
-            for result in self._send_datasets(event, datasets, total_datasets, storage_contexts):
-                if isinstance(result, tuple) and len(result) == 2:
-                    status, dataset = result
-                    sent_count += 1
-                    yield result
-                elif isinstance(result, int):
-                    yield result
+            # Released once here, whether the datasets are sent, empty, fail
+            # or are abandoned when pynetdicom closes this generator
+            sender = None
+            try:
+                if not datasets:
+                    self.logger.warning("No matching files found for C-GET request")
+                    yield DICOMStatus.OUT_OF_RESOURCES_SUB_OPERATIONS
                     return
-                else:
-                    self.logger.warning(f"Unexpected result type from _send_datasets: {type(result)}")
-                    yield result
-
-            failed_count = total_datasets - sent_count
 
-            if failed_count == 0:
-                self.logger.info(f" C-GET completed successfully: {sent_count}/{total_datasets} datasets sent")
-            elif sent_count > 0:
-                self.logger.warning(f" C-GET completed with warnings: {sent_count}/{total_datasets} datasets sent, {failed_count} failed")
-            else:
-                self.logger.error(f" C-GET failed: no datasets could be sent")
+                total_datasets = len(datasets)
+                self.logger.info(f"Found {total_datasets} datasets to retrieve")
+
+                yield total_datasets
+
+                sent_count = 0
+                failed_count = 0
+
+                sender = self._send_datasets(event, datasets, total_datasets,
+                                             storage_contexts, accepted_syntaxes)
+                for result in sender:
+                    if isinstance(result, tuple) and len(result) == 2:
+                        status, dataset = result
+                        yield result
+                        if status != DICOMStatus.PENDING:
+                            return
+                        sent_count += 1
+                    elif isinstance(result, int):
+                        yield result
+                        return
+                    else:
+                        self.logger.warning(f"Unexpected result type from _send_datasets: {type(result)}")
+                        yield result
+
+                failed_count = total_datasets - sent_count
+
+                if failed_count == 0:
+                    self.logger.info(f" C-GET completed successfully: {sent_count}/{total_datasets} datasets sent")
+                elif sent_count > 0:
+                    self.logger.warning(f" C-GET completed with warnings: {sent_count}/{total_datasets} datasets sent, {failed_count} failed")
+                else:
+                    self.logger.error(f" C-GET failed: no datasets could be sent")
 
-            self.logger.info("C-GET generator completed")
+                self.logger.info("C-GET generator completed")
+            finally:
+                # Stops the prefetch thread before its archive is closed
+                if sender is not None:
+                    sender.close()
+                self.release_datasets(datasets)
 
         except Exception as e:
             self.logger.error(f"Error in C-GET handler: {e}", exc_info=True)
@@ -134,55 +174,39 @@ class GetHandler(HandlerBase):
         self,
         identifier: Any,
         query_level: str,
-        study_uid: Optional[str],
-        transfer_syntax: str
+        study_uid: Optional[str]
     ) -> list:
         """
         Find datasets matching the query.
         Always downloads from API to get the latest/processed version.
 
+        Datasets keep their archived transfer syntax; file meta is prepared
+        per dataset in _send_datasets once the target syntax is known.
+
         Args:
             identifier: Query identifier
             query_level: Query level (STUDY, SERIES, IMAGE)
             study_uid: Study Instance UID
-            transfer_syntax: Preferred transfer syntax
 
         Returns:
             List of DICOM datasets
         """
-        if not self.api_query_service:
+        if not self.download_service:
             self.logger.error("No API access configured - cannot perform C-GET")
             return []
 
-        if not self.download_service:
-            from receiver.containers import container
-            from receiver.services.coordination import get_dispatch_lock_manager
-
-            api_client = container.ith_api_client()
-            lock_manager = get_dispatch_lock_manager()
-
-            self.download_service = DICOMDownloadService(
-                api_client=api_client,
-                resolver=self.resolver,
-                lock_manager=lock_manager
-            )
-
         self.logger.info("Downloading from ITH API...")
 
         if query_level == 'STUDY' and study_uid:
             datasets = self.download_service.download_study(
-                study_uid=study_uid,
-                transfer_syntax=transfer_syntax,
-                prepare_dataset_func=self.dataset_service.prepare_dataset
+                study_uid=study_uid
             )
         elif query_level == 'SERIES':
             series_uid = self.extract_uid(identifier, 'SeriesInstanceUID')
             if study_uid and series_uid:
                 datasets = self.download_service.download_series(
                     study_uid=study_uid,
-                    series_uid=series_uid,
-                    transfer_syntax=transfer_syntax,
-                    prepare_dataset_func=self.dataset_service.prepare_dataset
+                    series_uid=series_uid
                 )
             else:
                 self.logger.error("Missing UIDs for SERIES level query")
@@ -194,9 +218,7 @@ class GetHandler(HandlerBase):
                 datasets = self.download_service.download_image(
                     study_uid=study_uid,
                     series_uid=series_uid,
-                    sop_uid=sop_uid,
-                    transfer_syntax=transfer_syntax,
-                    prepare_dataset_func=self.dataset_service.prepare_dataset
+                    sop_uid=sop_uid
                 )
             else:
                 self.logger.error("Missing UIDs for IMAGE level query")
@@ -217,7 +239,8 @@ class GetHandler(HandlerBase):
         event: Any,
         datasets: list,
         total_datasets: int,
-        storage_contexts: list
+        storage_contexts: list,
+        accepted_syntaxes: Dict[str, set]
     ):
         """
         Send datasets to the requesting client.
@@ -227,11 +250,31 @@ class GetHandler(HandlerBase):
             datasets: List of datasets to send
             total_datasets: Total number of datasets
             storage_contexts: List of storage context UIDs
+            accepted_syntaxes: Accepted transfer syntaxes by SOP Class UID
 
         Yields:
-            Tuples of (status, dataset) or status codes
+            Tuples of (status, dataset) or status codes; a failed load ends
+            the sends with (0xB000, None)
         """
-        for idx, dataset in enumerate(datasets, 1):
+        log_every = max(1, total_datasets // 20)
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        patient_name = study_uid = None
+
+        loaded = enumerate(self._prefetch_datasets(datasets), 1)
+        idx = 0
+        while True:
+            try:
+                idx, dataset = next(loaded)
+            except StopIteration:
+                return
+            except Exception as e:
+                # Loading stopped (e.g. the archive could not be read); the
+                # unsent datasets are reported as failed sub-operations,
+                # which pynetdicom adds to the failed count with 0xB000
+                self.logger.error(f"Error loading datasets after {idx}/{total_datasets}: {e}", exc_info=True)
+                yield DICOMStatus.SUB_OPERATIONS_COMPLETE_WITH_FAILURES, None
+                return
+
             if event.is_cancelled:
                 self.logger.warning(f"C-GET cancelled by client after {idx-1} datasets")
                 yield DICOMStatus.CANCEL
@@ -239,43 +282,135 @@ class GetHandler(HandlerBase):
 
             try:
                 if idx == 1:
-                    self._log_first_instance(dataset, event, storage_contexts)
-
-                if idx % 10 == 0 or idx == total_datasets:
-                    progress = int(100 * idx / total_datasets)
-                    self.logger.info(f"Progress: {idx}/{total_datasets} datasets sent ({progress}%)")
-                else:
-                    self.logger.debug(f"Sending dataset {idx}/{total_datasets}")
-
-                self.logger.debug(f"Patient: {getattr(dataset, 'PatientName', 'Unknown')}")
-                self.logger.debug(f"Study: {getattr(dataset, 'StudyInstanceUID', 'Unknown')}")
-                self.logger.debug(f"SOP Class: {getattr(dataset, 'SOPClassUID', 'Unknown')}")
+                    self._log_first_instance(dataset, accepted_syntaxes, storage_contexts)
+
+                if idx == 1 or idx == total_datasets or idx % log_every == 0:
+                    self.logger.info(
+                        "Progress: %d/%d datasets sent (%d%%)",
+                        idx, total_datasets, 100 * idx // total_datasets
+                    )
+                elif debug_enabled:
+                    self.logger.debug("Sending dataset %d/%d", idx, total_datasets)
+
+                if debug_enabled:
+                    # Every instance of a C-GET belongs to the requested study,
+                    # so patient and study are read from the first dataset only
+                    if patient_name is None:
+                        patient_name = getattr(dataset, 'PatientName', 'Unknown')
+                        study_uid = getattr(dataset, 'StudyInstanceUID', 'Unknown')
+                    self.logger.debug(
+                        "Patient: %s, Study: %s, SOP Class: %s",
+                        patient_name, study_uid, getattr(dataset, 'SOPClassUID', 'Unknown')
+                    )
+
+                transfer_syntax = self._select_transfer_syntax_for(dataset, accepted_syntaxes)
+                self.dataset_service.prepare_dataset(dataset, transfer_syntax)
 
                 yield DICOMStatus.PENDING, dataset
 
             except Exception as e:
                 self.logger.error(f"Error processing dataset {idx}: {e}", exc_info=True)
 
-    def _log_first_instance(self, dataset: Any, event: Any, storage_contexts: list) -> None:
+    def _prefetch_datasets(self, datasets: Iterable[Any]) -> Iterator[Any]:
+        """
+        Load datasets on a background thread ahead of the send loop.
+
+        A producer thread iterates the datasets (which parses and resolves
+        each downloaded file) into a bounded queue, so the next files are
+        read while the SCU is storing the current one. Errors raised by the
+        producer are re-raised here, for _send_datasets to report. The
+        datasets are not closed here; handle_get releases them.
+
+        Args:
+            datasets: Datasets to send, typically a lazily loading stream
+
+        Yields:
+            DICOM datasets in order
+        """
+        buffer: queue.Queue = queue.Queue(maxsize=self.PREFETCH_QUEUE_SIZE)
+        stop = threading.Event()
+        done = object()
+
+        def put(item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            try:
+                for dataset in datasets:
+                    if not put(dataset):
+                        return
+                put(done)
+            except Exception as e:
+                put(e)
+            finally:
+                # PHI is resolved on this thread, which opened its own
+                # database connection; nothing else would close it
+                connection.close()
+
+        producer = threading.Thread(target=produce, name='c-get-prefetch', daemon=True)
+        producer.start()
+
+        try:
+            while True:
+                item = buffer.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            producer.join()
+
+    def _select_transfer_syntax_for(self, dataset: Any, accepted_syntaxes: Dict[str, set]) -> str:
+        """
+        Select the transfer syntax to send a dataset with.
+
+        The archived transfer syntax is passed through untouched when the
+        requester accepted it for the dataset's SOP Class, so compressed
+        pixel data goes out without transcoding.
+
+        Args:
+            dataset: DICOM dataset to send
+            accepted_syntaxes: Output of configure_association_contexts
+
+        Returns:
+            Transfer syntax UID
+        """
+        accepted = accepted_syntaxes.get(getattr(dataset, 'SOPClassUID', None), ())
+
+        file_meta = getattr(dataset, 'file_meta', None)
+        source_syntax = getattr(file_meta, 'TransferSyntaxUID', None) if file_meta is not None else None
+        if source_syntax and source_syntax in accepted:
+            return source_syntax
+
+        for syntax in self.FALLBACK_TRANSFER_SYNTAXES:
+            if syntax in accepted:
+                return syntax
+
+        return ImplicitVRLittleEndian
+
+    def _log_first_instance(self, dataset: Any, accepted_syntaxes: Dict[str, set], storage_contexts: list) -> None:
         """
         Log details about the first instance for verification.
 
         Args:
             dataset: First DICOM dataset
-            event: pynetdicom event
+            accepted_syntaxes: Accepted transfer syntaxes by SOP Class UID
             storage_contexts: List of storage context UIDs
         """
         sop_class = getattr(dataset, 'SOPClassUID', 'Unknown')
         self.logger.info(f"First instance SOP Class: {sop_class}")
 
-        has_matching_context = False
-        for cx in event.assoc.accepted_contexts:
-            if cx.abstract_syntax == sop_class:
-                has_matching_context = True
-                self.logger.info(f"Found matching context for SOP Class {sop_class}")
-                break
-
-        if not has_matching_context:
+        if sop_class in accepted_syntaxes:
+            self.logger.info(f"Found matching context for SOP Class {sop_class}")
+        else:
             self.logger.error(f"NO MATCHING CONTEXT for SOP Class {sop_class}!")
             self.logger.error(f"Available storage contexts: {storage_contexts}")
 
@@ -2,7 +2,8 @@
 C-MOVE Handler for DICOM operations.
 Handles C-MOVE requests to send DICOM studies to configured PACS nodes.
 """
-from typing import Any, Optional, TYPE_CHECKING
+import logging
+from typing import Any, Generator, Iterable, Optional, Sized, Tuple, TYPE_CHECKING
 
 from receiver.controllers.base import HandlerBase, DICOMStatus
 from receiver.controllers.dicom.services import DICOMDownloadService, DICOMDatasetService
@@ -44,6 +45,16 @@ class MoveHandler(HandlerBase):
         self.dataset_service = DICOMDatasetService()
         self.download_service: Optional[DICOMDownloadService] = None
 
+        # Built here so the first retrieve does not pay for it
+        if api_query_service is not None:
+            from receiver.services.coordination import get_dispatch_lock_manager
+
+            self.download_service = DICOMDownloadService(
+                api_client=api_query_service.api_client,
+                resolver=resolver,
+                lock_manager=get_dispatch_lock_manager()
+            )
+
     def handle_move(self, event: Any):
         """
         Handle C-MOVE request.
@@ -78,9 +89,12 @@ class MoveHandler(HandlerBase):
                 return
 
             self.log_operation_start("C-MOVE", calling_info)
-            self.logger.info(f"Move Destination AE: {move_destination}")
+            self.logger.debug(f"Move Destination AE: {move_destination}")
 
-            identifier = self.decode_identifier(request.Identifier)
+            identifier = self.decode_identifier(
+                request.Identifier,
+                specific_tags=self.RETRIEVE_IDENTIFIER_TAGS
+            )
             query_level = self.get_query_level(identifier)
             study_uid = self.extract_uid(identifier, 'StudyInstanceUID')
 
@@ -97,31 +111,38 @@ class MoveHandler(HandlerBase):
                 yield DICOMStatus.MOVE_DESTINATION_UNKNOWN
                 return
 
-            self.logger.info(f"Destination: {destination_ip}:{destination_port}")
+            self.logger.debug(f"Destination: {destination_ip}:{destination_port}")
 
             datasets = self._find_datasets(identifier, query_level, study_uid)
 
-            if not datasets:
-                self.logger.warning("No matching files found for C-MOVE request")
-                yield DICOMStatus.OUT_OF_RESOURCES_SUB_OPERATIONS
-                return
-
-            total_datasets = len(datasets)
-            self.logger.info(f"Found {total_datasets} datasets to move")
-            self.logger.info(f"Initiating C-MOVE to {move_destination}")
+            # Released once here, whether the datasets are sent, empty, fail
+            # or are abandoned when pynetdicom closes this generator
+            try:
+                if not datasets:
+                    self.logger.warning("No matching files found for C-MOVE request")
+                    yield DICOMStatus.OUT_OF_RESOURCES_SUB_OPERATIONS
+                    return
+
+                total_datasets = len(datasets)
+                self.logger.info(
+                    "Initiating C-MOVE of %d datasets to %s (%s:%s)",
+                    total_datasets, move_destination, destination_ip, destination_port
+                )
 
-            yield (destination_ip, destination_port)
+                yield (destination_ip, destination_port)
 
-            yield total_datasets
+                yield total_datasets
 
-            sent_count, failed_count = self._send_datasets(event, datasets, total_datasets)
+                sent_count, failed_count = yield from self._send_datasets(event, datasets, total_datasets)
 
-            final_status = self.get_status_for_results(total_datasets, sent_count, failed_count)
-            self.logger.info(f"C-MOVE completed: {sent_count}/{total_datasets} sent, {failed_count} failed")
-            yield final_status
+                final_status = self.get_status_for_results(total_datasets, sent_count, failed_count)
+                self.logger.info(f"C-MOVE completed: {sent_count}/{total_datasets} sent, {failed_count} failed")
+                yield final_status
 
-            self.log_operation_complete("C-MOVE", failed_count == 0,
-                                       f"{sent_count}/{total_datasets} datasets sent")
+                self.log_operation_complete("C-MOVE", failed_count == 0,
+                                           f"{sent_count}/{total_datasets} datasets sent")
+            finally:
+                self.release_datasets(datasets)
 
         except Exception as e:
             self.logger.error(f"Error in C-MOVE handler: {e}", exc_info=True)
@@ -137,10 +158,10 @@ class MoveHandler(HandlerBase):
         Returns:
             Move destination AE title
         """
-        if hasattr(request.MoveDestination, 'decode'):
-            return request.MoveDestination.decode('utf-8').strip()
-        else:
-            return str(request.MoveDestination).strip()
+        move_destination = request.MoveDestination
+        if isinstance(move_destination, bytes):
+            move_destination = move_destination.decode('utf-8')
+        return str(move_destination).strip()
 
     def _check_destination_access(self, ae_title: str) -> tuple:
         """
@@ -153,9 +174,7 @@ class MoveHandler(HandlerBase):
             Tuple of (allowed, reason)
         """
         try:
-            from receiver.services.config import get_access_control_service
-
-            access_control = get_access_control_service()
+            access_control = self.get_access_control()
             if not access_control:
                 return True, "No access control configured"
 
@@ -180,22 +199,20 @@ class MoveHandler(HandlerBase):
             Tuple of (ip, port) or (None, None)
         """
         try:
-            nodes = self.config_service.get_all_nodes()
-
-            for node in nodes:
-                if node.ae_title.upper().strip() == ae_title.upper().strip():
-                    if not node.is_active:
-                        self.logger.warning(f"Node {node.name} ({ae_title}) is inactive")
-                        continue
-
-                    if not node.is_reachable:
-                        self.logger.warning(f"Node {node.name} ({ae_title}) is not reachable")
-                        continue
-
-                    self.logger.info(f"Found node: {node.name} ({ae_title})")
-                    self.logger.info(f"Address: {node.host}:{node.port}")
-                    self.logger.info(f"Permission: {node.permission}")
-                    return (node.host, node.port)
+            for node in self.config_service.get_nodes_by_ae_title(ae_title):
+                if not node.is_active:
+                    self.logger.warning(f"Node {node.name} ({ae_title}) is inactive")
+                    continue
+
+                if not node.is_reachable:
+                    self.logger.warning(f"Node {node.name} ({ae_title}) is not reachable")
+                    continue
+
+                self.logger.info(
+                    "Found node: %s (%s) at %s:%s, permission %s",
+                    node.name, ae_title, node.host, node.port, node.permission
+                )
+                return (node.host, node.port)
 
             self.logger.warning(f"No active/reachable node found for AE title: {ae_title}")
             return (None, None)
@@ -209,56 +226,39 @@ class MoveHandler(HandlerBase):
         identifier: Any,
         query_level: str,
         study_uid: Optional[str]
-    ) -> list:
+    ) -> Sized:
         """
         Find datasets matching the query.
         Always downloads from API to get the latest/processed version.
 
+        Study and series downloads are returned as a lazily loading stream
+        whose length comes from the archive's central directory, so the
+        sub-operation count is known without parsing any instance.
+
         Args:
             identifier: Query identifier
             query_level: Query level (STUDY, SERIES, IMAGE)
             study_uid: Study Instance UID
 
         Returns:
-            List of DICOM datasets
+            Sized iterable of DICOM datasets
         """
-        if not self.api_query_service:
+        if not self.download_service:
             self.logger.error("No API access configured - cannot perform C-MOVE")
             return []
 
-        if not self.download_service:
-            from receiver.containers import container
-            from receiver.services.coordination import get_dispatch_lock_manager
-
-            api_client = container.ith_api_client()
-            lock_manager = get_dispatch_lock_manager()
-
-            self.download_service = DICOMDownloadService(
-                api_client=api_client,
-                resolver=self.resolver,
-                lock_manager=lock_manager
-            )
-
         self.logger.info("Downloading from ITH API (latest version)...")
 
-
-        def no_op_prepare(ds, ts):
-            pass
-
         if query_level == 'STUDY' and study_uid:
             datasets = self.download_service.download_study(
-                study_uid=study_uid,
-                transfer_syntax='',
-                prepare_dataset_func=no_op_prepare
+                study_uid=study_uid
             )
         elif query_level == 'SERIES':
             series_uid = self.extract_uid(identifier, 'SeriesInstanceUID')
             if study_uid and series_uid:
                 datasets = self.download_service.download_series(
                     study_uid=study_uid,
-                    series_uid=series_uid,
-                    transfer_syntax='',
-                    prepare_dataset_func=no_op_prepare
+                    series_uid=series_uid
                 )
             else:
                 self.logger.error("Missing UIDs for SERIES level query")
@@ -270,9 +270,7 @@ class MoveHandler(HandlerBase):
                 datasets = self.download_service.download_image(
                     study_uid=study_uid,
                     series_uid=series_uid,
-                    sop_uid=sop_uid,
-                    transfer_syntax='',
-                    prepare_dataset_func=no_op_prepare
+                    sop_uid=sop_uid
                 )
             else:
                 self.logger.error("Missing UIDs for IMAGE level query")
@@ -282,48 +280,71 @@ class MoveHandler(HandlerBase):
             datasets = []
 
         if datasets:
-            self.logger.info(f"Downloaded {len(datasets)} datasets from API")
+            self.logger.info(f"Downloaded {len(datasets)} instances from API")
         else:
             self.logger.warning("No data found in API")
 
         return datasets
 
-    def _send_datasets(self, event: Any, datasets: list, total_datasets: int) -> tuple:
+    def _send_datasets(
+        self,
+        event: Any,
+        datasets: Iterable[Any],
+        total_datasets: int
+    ) -> Generator[Any, None, Tuple[int, int]]:
         """
         Send datasets with PHI resolved.
 
+        Datasets are pulled from the iterable one at a time, so loading
+        overlaps with the C-STORE of the previous one. PHI is resolved by
+        the download service while loading, with one mapping lookup per
+        patient in the archive, so datasets are sent as they arrive.
+
+        Reading and resolving happen in the stream's loader, which drops
+        instances that fail; the loop itself cannot fail per dataset, and
+        dropped instances are counted as failures at the end.
+
         Args:
             event: pynetdicom event
-            datasets: List of datasets to send
+            datasets: Datasets to send
             total_datasets: Total number of datasets
 
+        Yields:
+            (status, dataset) pairs, or a status on cancel or failure
+
         Returns:
-            Tuple of (sent_count, failed_count)
+            Tuple of (sent_count, failed_count), via yield from
         """
         sent_count = 0
-        failed_count = 0
+        log_every = max(1, total_datasets // 20)
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
 
         for dataset in datasets:
             if event.is_cancelled:
                 self.logger.warning(f"C-MOVE cancelled by client after {sent_count} datasets")
                 yield DICOMStatus.CANCEL
-                return sent_count, failed_count
+                return sent_count, 0
 
-            try:
-                dataset = self.resolver.resolve_dataset(dataset)
-
-                sent_count += 1
-                self.logger.info(f"Sending dataset {sent_count}/{total_datasets}")
-                self.logger.debug(f"Patient: {getattr(dataset, 'PatientName', 'Unknown')}")
-                self.logger.debug(f"Study: {getattr(dataset, 'StudyInstanceUID', 'Unknown')}")
-
-                yield DICOMStatus.PENDING, dataset
+            sent_count += 1
+            if sent_count == 1 or sent_count == total_datasets or sent_count % log_every == 0:
+                self.logger.info(
+                    "Progress: %d/%d datasets sent (%d%%)",
+                    sent_count, total_datasets, 100 * sent_count // total_datasets
+                )
+            elif debug_enabled:
+                self.logger.debug("Sending dataset %d/%d", sent_count, total_datasets)
+
+            if debug_enabled:
+                self.logger.debug(
+                    "Patient: %s, Study: %s",
+                    getattr(dataset, 'PatientName', 'Unknown'),
+                    getattr(dataset, 'StudyInstanceUID', 'Unknown')
+                )
 
-            except Exception as e:
-                failed_count += 1
-                self.logger.error(f"Error processing dataset: {e}", exc_info=True)
-                yield DICOMStatus.SUB_OPERATIONS_COMPLETE_WITH_FAILURES
+            yield DICOMStatus.PENDING, dataset
 
+        # Instances that failed to load were dropped (and logged) by the stream
+        failed_count = max(0, total_datasets - sent_count)
         return sent_count, failed_count
 
     def handle(self, event: Any):
@@ -6,9 +6,18 @@ import logging
 from pathlib import Path
 from typing import Any, TYPE_CHECKING
 from pydicom import dcmread, dataset as pydicom_dataset
+from pydicom.dataelem import DataElement
+from pydicom.errors import InvalidDicomError
 from pydicom.uid import ImplicitVRLittleEndian, ExplicitVRLittleEndian
 import pydicom
 
+from receiver.controllers.storage_manager import StorageWriteError
+from receiver.services.config.access_control_service import (
+    extract_calling_ae_title,
+    extract_requester_address,
+    get_access_control_service,
+)
+
 if TYPE_CHECKING:
     from receiver.controllers.storage_manager import StorageManager
     from receiver.controllers.phi.anonymizer import PHIAnonymizer
@@ -16,11 +25,28 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger('receiver.handlers.store')
 
+# DICOM preamble; bytes are immutable, so every dataset can share it
+_EMPTY_PREAMBLE = b'\x00' * 128
+
+# Tags every stored instance must carry, as (tag, keyword)
+_REQUIRED_TAGS = (
+    (0x0020000D, 'StudyInstanceUID'),
+    (0x0020000E, 'SeriesInstanceUID'),
+    (0x00080018, 'SOPInstanceUID'),
+)
+
+# File meta elements that are identical for every stored file, as (tag, VR, value)
+_STATIC_FILE_META = (
+    (0x00020001, 'OB', b'\x00\x01'),
+    (0x00020012, 'UI', pydicom.uid.PYDICOM_IMPLEMENTATION_UID),
+    (0x00020013, 'SH', 'PYDICOM'),
+)
+
 
 class StoreHandler:
     """Handler for C-STORE operations - receives and stores DICOM files."""
 
-    SUPPORTED_MODALITIES = ['CT', 'PT', 'MR']
+    SUPPORTED_MODALITIES = frozenset({'CT', 'PT', 'MR'})
 
     def __init__(
         self,
@@ -54,26 +80,27 @@ class StoreHandler:
             dataset: DICOM dataset to fix
         """
         try:
-            if not hasattr(dataset, 'preamble') or dataset.preamble is None:
-                dataset.preamble = b'\x00' * 128
+            if getattr(dataset, 'preamble', None) is None:
+                dataset.preamble = _EMPTY_PREAMBLE
                 logger.debug("Added 128-byte DICOM preamble for viewer compatibility")
 
-            if not hasattr(dataset, 'file_meta') or dataset.file_meta is None:
-                dataset.file_meta = pydicom_dataset.FileMetaDataset()
+            file_meta = getattr(dataset, 'file_meta', None)
+            if file_meta is None:
+                file_meta = dataset.file_meta = pydicom_dataset.FileMetaDataset()
                 logger.debug("Created file_meta dataset")
 
-            if not hasattr(dataset.file_meta, 'TransferSyntaxUID') or dataset.file_meta.TransferSyntaxUID is None:
-                dataset.file_meta.TransferSyntaxUID = ExplicitVRLittleEndian
-                logger.debug(f"No TransferSyntaxUID found, setting default: {ExplicitVRLittleEndian}")
+            # Elements are written by tag, skipping the keyword and VR lookups
+            transfer_syntax = file_meta.get('TransferSyntaxUID')
+            if transfer_syntax is None:
+                file_meta[0x00020010] = DataElement(0x00020010, 'UI', ExplicitVRLittleEndian)
+                logger.debug("No TransferSyntaxUID found, setting default: %s", ExplicitVRLittleEndian)
             else:
-                logger.debug(f"Preserving original TransferSyntaxUID: {dataset.file_meta.TransferSyntaxUID}")
+                logger.debug("Preserving original TransferSyntaxUID: %s", transfer_syntax)
 
-            dataset.file_meta.MediaStorageSOPClassUID = dataset.SOPClassUID
-            dataset.file_meta.MediaStorageSOPInstanceUID = dataset.SOPInstanceUID
-            dataset.file_meta.ImplementationClassUID = pydicom.uid.PYDICOM_IMPLEMENTATION_UID
-            dataset.file_meta.ImplementationVersionName = "PYDICOM"
-
-            dataset.file_meta.FileMetaInformationVersion = b'\x00\x01'
+            file_meta[0x00020002] = DataElement(0x00020002, 'UI', dataset.SOPClassUID)
+            file_meta[0x00020003] = DataElement(0x00020003, 'UI', dataset.SOPInstanceUID)
+            for tag, vr, value in _STATIC_FILE_META:
+                file_meta[tag] = DataElement(tag, vr, value)
 
         except Exception as e:
             logger.warning(f"Error fixing DICOM metadata: {e}", exc_info=True)
@@ -87,10 +114,10 @@ class StoreHandler:
             event: pynetdicom event object
 
         Returns:
-            int: DICOM status code (0x0000 = success, 0xC000 = failure)
+            int: DICOM status code (0x0000 = success, 0xA700 = out of
+            resources, 0xC000 = failure)
         """
         try:
-            from receiver.services.config.access_control_service import extract_calling_ae_title, extract_requester_address, get_access_control_service
             calling_ae = extract_calling_ae_title(event)
             requester_ip = extract_requester_address(event)
 
@@ -107,8 +134,8 @@ class StoreHandler:
 
             dataset = event.dataset
 
-            required_tags = ['StudyInstanceUID', 'SeriesInstanceUID', 'SOPInstanceUID']
-            missing_tags = [tag for tag in required_tags if not hasattr(dataset, tag)]
+            # Checked by tag: a plain dict lookup, no keyword resolution
+            missing_tags = [keyword for tag, keyword in _REQUIRED_TAGS if tag not in dataset]
 
             if missing_tags:
                 logger.error(f" Missing required DICOM tags: {', '.join(missing_tags)}")
@@ -117,23 +144,20 @@ class StoreHandler:
             modality = getattr(dataset, 'Modality', 'UNKNOWN')
             if modality not in self.SUPPORTED_MODALITIES:
                 logger.warning(f" Rejected unsupported modality: {modality}")
-                logger.warning(f"Supported modalities: {', '.join(self.SUPPORTED_MODALITIES)}")
+                logger.warning(f"Supported modalities: {', '.join(sorted(self.SUPPORTED_MODALITIES))}")
                 return 0xC001
 
-            logger.info("=" * 60)
-            logger.info(" RECEIVED C-STORE REQUEST")
-            logger.info(f"From: {calling_ae}")
-            logger.info(f"Modality: {modality}")
-            logger.info(f"Patient: {getattr(dataset, 'PatientName', 'Unknown')}")
-            logger.info(f"Study UID: {dataset.StudyInstanceUID}")
-            logger.info(f"Series UID: {dataset.SeriesInstanceUID}")
-            logger.info(f"Instance UID: {dataset.SOPInstanceUID}")
-            logger.info("=" * 60)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "C-STORE from %s: %s, patient %s, study %s, series %s, instance %s",
+                    calling_ae, modality, getattr(dataset, 'PatientName', 'Unknown'),
+                    dataset.StudyInstanceUID, dataset.SeriesInstanceUID, dataset.SOPInstanceUID
+                )
 
             should_anonymize = True
             if self.config_service:
                 should_anonymize = self.config_service.is_phi_anonymization_enabled()
-                logger.info(f" PHI Anonymization: {'Enabled' if should_anonymize else 'Disabled'}")
+                logger.debug(f" PHI Anonymization: {'Enabled' if should_anonymize else 'Disabled'}")
 
             study_phi = None
             series_phi = None
@@ -143,8 +167,8 @@ class StoreHandler:
                 mapping = phi_data['mapping']
                 study_phi = phi_data['study_phi']
                 series_phi = phi_data['series_phi']
-                logger.info(f" Anonymized: {mapping['original_name']} → {mapping['anonymous_name']}")
-                logger.debug(f" PHI extracted - Study: {len(study_phi)} fields, Series: {len(series_phi)} fields")
+                logger.info(" Anonymized: %s → %s", mapping['original_name'], mapping['anonymous_name'])
+                logger.debug(" PHI extracted - Study: %d fields, Series: %d fields", len(study_phi), len(series_phi))
             else:
                 logger.info(f"Storing with original PHI (anonymization disabled)")
 
@@ -159,11 +183,26 @@ class StoreHandler:
                 series_phi_metadata=series_phi
             )
 
-            logger.info(f" Stored to: {result['series'].storage_path}")
-            logger.info(f" Study stats: {result['series'].instances_count} instances in series")
+            series = result['series']
+            logger.info(
+                " Stored to: %s (%s instances in series)",
+                series.storage_path, series.instances_count
+            )
 
             return 0x0000
 
+        # Expected failures are reported without a traceback; the write
+        # error itself was already logged with details where it happened.
+        # Only a failed write is out of resources; other OSErrors (e.g.
+        # from API or PHI lookups) are failures like any other error
+        except StorageWriteError as e:
+            logger.error(" Could not store DICOM file: %s", e)
+            return 0xA700
+
+        except InvalidDicomError as e:
+            logger.warning(" Invalid DICOM dataset: %s", e)
+            return 0xC000
+
         except Exception as e:
             logger.error(f" Error storing DICOM file: {e}", exc_info=True)
             return 0xC000
\ No newline at end of file
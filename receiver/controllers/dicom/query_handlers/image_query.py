@@ -5,12 +5,28 @@ This handler queries from XML metadata files.
 """
 import logging
 from pathlib import Path
+from typing import Set
 from pydicom import Dataset
+from pydicom.dataelem import DataElement
 from receiver.models import Session, Scan
 from receiver.utils.storage import InstanceMetadataHandler
 
 logger = logging.getLogger('receiver.query.image')
 
+# Closes each query's log output; emitted with the summary as one record
+_SEPARATOR = '=' * 60
+
+# Response elements as (tag, VR, API key, default), written by tag so
+# each response skips the keyword and VR dictionary lookups
+_IMAGE_RESPONSE_ELEMENTS = (
+    (0x00100010, 'PN', 'PatientName', ''),
+    (0x00100020, 'LO', 'PatientID', ''),
+    (0x0020000D, 'UI', 'StudyInstanceUID', ''),
+    (0x0020000E, 'UI', 'SeriesInstanceUID', ''),
+    (0x00080018, 'UI', 'SOPInstanceUID', ''),
+    (0x00200013, 'IS', 'InstanceNumber', 0),
+)
+
 
 class ImageQueryHandler:
     """Handler for image-level C-FIND queries."""
@@ -47,8 +63,9 @@ class ImageQueryHandler:
             yield 0x0000, None
             return
 
-        study_uid = query_ds.StudyInstanceUID if hasattr(query_ds, 'StudyInstanceUID') else None
-        series_uid = query_ds.SeriesInstanceUID if hasattr(query_ds, 'SeriesInstanceUID') else None
+        study_uid = getattr(query_ds, 'StudyInstanceUID', None)
+        series_uid = getattr(query_ds, 'SeriesInstanceUID', None)
+        sop_uids = self._get_sop_instance_uids(query_ds)
 
         if not study_uid or not series_uid:
             logger.warning("IMAGE query requires both StudyInstanceUID and SeriesInstanceUID")
@@ -56,7 +73,9 @@ class ImageQueryHandler:
             return
 
         logger.info(f"Querying ITH API for images in series {series_uid}...")
-        api_images = self.api_query_service.query_images_for_series(study_uid, series_uid)
+        api_images = self.api_query_service.query_images_for_series(
+            study_uid, series_uid, sop_instance_uids=sop_uids or None
+        )
 
         if not api_images:
             logger.info("No images found from API")
@@ -68,25 +87,44 @@ class ImageQueryHandler:
         response_count = 0
         for image_info in api_images:
             response_ds = Dataset()
-            response_ds.QueryRetrieveLevel = 'IMAGE'
+            response_ds[0x00080052] = DataElement(0x00080052, 'CS', 'IMAGE')
 
-            response_ds.PatientName = image_info.get('PatientName', '')
-            response_ds.PatientID = image_info.get('PatientID', '')
-            response_ds.StudyInstanceUID = image_info.get('StudyInstanceUID', '')
-            response_ds.SeriesInstanceUID = image_info.get('SeriesInstanceUID', '')
-            response_ds.SOPInstanceUID = image_info.get('SOPInstanceUID', '')
-            response_ds.InstanceNumber = image_info.get('InstanceNumber', 0)
+            for tag, vr, key, default in _IMAGE_RESPONSE_ELEMENTS:
+                response_ds[tag] = DataElement(tag, vr, image_info.get(key, default))
 
             if image_info.get('SOPClassUID'):
-                response_ds.SOPClassUID = image_info['SOPClassUID']
+                response_ds[0x00080016] = DataElement(0x00080016, 'UI', image_info['SOPClassUID'])
 
-            logger.info(f"  Returning image #{response_count + 1}:")
-            logger.info(f"   Instance: {response_ds.InstanceNumber}")
-            logger.info(f"   SOP UID: {response_ds.SOPInstanceUID}")
+            logger.info(
+                "  Returning image #%d: instance %s, SOP UID %s",
+                response_count + 1,
+                image_info.get('InstanceNumber', 0),
+                image_info.get('SOPInstanceUID', '')
+            )
 
             response_count += 1
             yield 0xFF00, response_ds
 
-        logger.info(f"IMAGE query completed (API) - returned {response_count} images")
-        logger.info("=" * 60)
+        logger.info("IMAGE query completed (API) - returned %d images\n%s", response_count, _SEPARATOR)
         yield 0x0000, None
+
+    @staticmethod
+    def _get_sop_instance_uids(query_ds) -> Set[str]:
+        """
+        Read the requested SOP Instance UIDs from the query.
+
+        List matching allows several UIDs, which pydicom returns as a
+        MultiValue rather than a single UID.
+
+        Args:
+            query_ds: Query dataset
+
+        Returns:
+            Set of non-empty UIDs; empty if the key is absent or universal
+        """
+        value = getattr(query_ds, 'SOPInstanceUID', None)
+        if not value:
+            return set()
+        if isinstance(value, str):
+            value = [value]
+        return {str(uid) for uid in value if uid}
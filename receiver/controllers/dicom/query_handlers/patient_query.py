@@ -3,10 +3,20 @@ Patient Query Handler for DICOM C-FIND operations at PATIENT level.
 """
 import logging
 from pydicom import Dataset
+from pydicom.dataelem import DataElement
 from receiver.models import Session
 
 logger = logging.getLogger('receiver.query.patient')
 
+# Closes each query's log output; emitted with the summary as one record
+_SEPARATOR = '=' * 60
+
+# Optional response elements as (tag, VR, API key), written only when set
+_PATIENT_OPTIONAL_ELEMENTS = (
+    (0x00100030, 'DA', 'PatientBirthDate'),
+    (0x00100040, 'CS', 'PatientSex'),
+)
+
 
 class PatientQueryHandler:
     """Handler for patient-level C-FIND queries."""
@@ -54,23 +64,24 @@ class PatientQueryHandler:
 
         response_count = 0
         for patient_info in api_patients:
+            # Written by tag, skipping the keyword and VR dictionary lookups
             response_ds = Dataset()
-            response_ds.QueryRetrieveLevel = 'PATIENT'
-
-            response_ds.PatientName = patient_info.get('PatientName', '')
-            response_ds.PatientID = patient_info.get('PatientID', '')
+            response_ds[0x00080052] = DataElement(0x00080052, 'CS', 'PATIENT')
+            response_ds[0x00100010] = DataElement(0x00100010, 'PN', patient_info.get('PatientName', ''))
+            response_ds[0x00100020] = DataElement(0x00100020, 'LO', patient_info.get('PatientID', ''))
 
-            if patient_info.get('PatientBirthDate'):
-                response_ds.PatientBirthDate = patient_info['PatientBirthDate']
-            if patient_info.get('PatientSex'):
-                response_ds.PatientSex = patient_info['PatientSex']
+            for tag, vr, key in _PATIENT_OPTIONAL_ELEMENTS:
+                value = patient_info.get(key)
+                if value:
+                    response_ds[tag] = DataElement(tag, vr, value)
 
-            logger.info(f"   Returning patient #{response_count + 1}:")
-            logger.info(f"   Patient: {response_ds.PatientName} (ID: {response_ds.PatientID})")
+            logger.info(
+                "   Returning patient #%d: %s (ID: %s)",
+                response_count + 1, patient_info.get('PatientName', ''), patient_info.get('PatientID', '')
+            )
 
             response_count += 1
             yield 0xFF00, response_ds
 
-        logger.info(f"PATIENT query completed (API) - returned {response_count} patients")
-        logger.info("=" * 60)
+        logger.info("PATIENT query completed (API) - returned %d patients\n%s", response_count, _SEPARATOR)
         yield 0x0000, None
@@ -3,10 +3,26 @@ Series Query Handler for DICOM C-FIND operations at SERIES level.
 """
 import logging
 from pydicom import Dataset
-from receiver.models import Session, Scan
+from pydicom.dataelem import DataElement
 
 logger = logging.getLogger('receiver.query.series')
 
+# Closes each query's log output; emitted with the summary as one record
+_SEPARATOR = '=' * 60
+
+# Response elements as (tag, VR, API key, default), written by tag so
+# each response skips the keyword and VR dictionary lookups
+_SERIES_RESPONSE_ELEMENTS = (
+    (0x00100010, 'PN', 'PatientName', ''),
+    (0x00100020, 'LO', 'PatientID', ''),
+    (0x0020000D, 'UI', 'StudyInstanceUID', ''),
+    (0x0020000E, 'UI', 'SeriesInstanceUID', ''),
+    (0x00200011, 'IS', 'SeriesNumber', 0),
+    (0x0008103E, 'LO', 'SeriesDescription', ''),
+    (0x00080060, 'CS', 'Modality', ''),
+    (0x00201209, 'IS', 'NumberOfSeriesRelatedInstances', 0),
+)
+
 
 class SeriesQueryHandler:
     """Handler for series-level C-FIND queries."""
@@ -36,53 +52,12 @@ class SeriesQueryHandler:
         """
         logger.info("Processing SERIES level C-FIND")
 
-        filters = {}
-        study_filters = {}
-
-        if hasattr(query_ds, 'StudyInstanceUID') and query_ds.StudyInstanceUID:
-            study_filters['study_instance_uid'] = query_ds.StudyInstanceUID
-            logger.debug(f"Filtering by Study UID: {query_ds.StudyInstanceUID}")
-
-        if hasattr(query_ds, 'SeriesInstanceUID') and query_ds.SeriesInstanceUID:
-            filters['series_instance_uid'] = query_ds.SeriesInstanceUID
-            logger.debug(f"Filtering by Series UID: {query_ds.SeriesInstanceUID}")
-
-        if hasattr(query_ds, 'SeriesNumber') and query_ds.SeriesNumber:
-            filters['series_number'] = int(query_ds.SeriesNumber)
-            logger.debug(f"Filtering by Series Number: {query_ds.SeriesNumber}")
-
-        if hasattr(query_ds, 'Modality') and query_ds.Modality:
-            filters['modality'] = query_ds.Modality
-            logger.debug(f"Filtering by Modality: {query_ds.Modality}")
-
-        if hasattr(query_ds, 'PatientID') and query_ds.PatientID:
-            anonymized_id = self.resolver.resolve_to_anonymous(original_id=query_ds.PatientID)
-            if anonymized_id:
-                study_filters['patient_id'] = anonymized_id
-                logger.debug(f"Filtering by Patient ID: {query_ds.PatientID} (anonymized)")
-            else:
-                study_filters['patient_id'] = query_ds.PatientID
-                logger.debug(f"Filtering by Patient ID: {query_ds.PatientID}")
-
-        if hasattr(query_ds, 'PatientName') and query_ds.PatientName:
-            anonymized_name = self.resolver.resolve_to_anonymous(original_name=str(query_ds.PatientName))
-            if anonymized_name:
-                study_filters['patient_name'] = anonymized_name
-                logger.debug(f"Filtering by Patient Name: {query_ds.PatientName} (anonymized)")
-            else:
-                study_filters['patient_name'] = str(query_ds.PatientName)
-                logger.debug(f"Filtering by Patient Name: {query_ds.PatientName}")
-
-        if study_filters:
-            for key, value in study_filters.items():
-                filters[f'session__{key}'] = value
-
         if not self.api_query_service:
             logger.error("API query service not available")
             yield 0x0000, None
             return
 
-        study_uid = query_ds.StudyInstanceUID if hasattr(query_ds, 'StudyInstanceUID') else None
+        study_uid = getattr(query_ds, 'StudyInstanceUID', None)
         if not study_uid:
             logger.warning("No StudyInstanceUID provided for SERIES query")
             yield 0x0000, None
@@ -101,28 +76,23 @@ class SeriesQueryHandler:
         response_count = 0
         for series_info in api_series:
             response_ds = Dataset()
-            response_ds.QueryRetrieveLevel = 'SERIES'
-
-            response_ds.PatientName = series_info.get('PatientName', '')
-            response_ds.PatientID = series_info.get('PatientID', '')
-
-            response_ds.StudyInstanceUID = series_info.get('StudyInstanceUID', '')
+            response_ds[0x00080052] = DataElement(0x00080052, 'CS', 'SERIES')
 
-            response_ds.SeriesInstanceUID = series_info.get('SeriesInstanceUID', '')
-            response_ds.SeriesNumber = series_info.get('SeriesNumber', 0)
-            response_ds.SeriesDescription = series_info.get('SeriesDescription', '')
-            response_ds.Modality = series_info.get('Modality', '')
-            response_ds.NumberOfSeriesRelatedInstances = series_info.get('NumberOfSeriesRelatedInstances', 0)
+            for tag, vr, key, default in _SERIES_RESPONSE_ELEMENTS:
+                response_ds[tag] = DataElement(tag, vr, series_info.get(key, default))
 
-            logger.info(f"Returning series #{response_count + 1}: {response_ds.SeriesDescription or 'No Description'}")
-            logger.info(f"   - SeriesInstanceUID: {response_ds.SeriesInstanceUID}")
-            logger.info(f"   - SeriesNumber: {response_ds.SeriesNumber}")
-            logger.info(f"   - Modality: {response_ds.Modality}")
-            logger.info(f"   - Instances: {response_ds.NumberOfSeriesRelatedInstances}")
+            logger.info(
+                "Returning series #%d: %s (UID: %s, number: %s, modality: %s, instances: %s)",
+                response_count + 1,
+                series_info.get('SeriesDescription') or 'No Description',
+                series_info.get('SeriesInstanceUID', ''),
+                series_info.get('SeriesNumber', 0),
+                series_info.get('Modality', ''),
+                series_info.get('NumberOfSeriesRelatedInstances', 0)
+            )
 
             response_count += 1
             yield 0xFF00, response_ds
 
-        logger.info(f"SERIES query completed (API) - returned {response_count} series")
-        logger.info("=" * 60)
+        logger.info("SERIES query completed (API) - returned %d series\n%s", response_count, _SEPARATOR)
         yield 0x0000, None
@@ -2,38 +2,15 @@
 Study Query Handler for DICOM C-FIND operations at STUDY level.
 """
 import logging
-from typing import Dict
+from typing import Any, Dict, Set
 from pydicom import Dataset
+from pydicom.dataelem import DataElement
 from receiver.models import Session
-from django.db.models import Q
 
 logger = logging.getLogger('receiver.query.study')
 
-
-def dicom_wildcard_to_django(value: str) -> tuple:
-    """
-    Convert DICOM wildcard pattern to Django query.
-    DICOM uses * for any characters, ? for single character.
-
-    Args:
-        value: DICOM query value with wildcards
-
-    Returns:
-        Tuple of (lookup_type, converted_value)
-        - If no wildcards: ('exact', value)
-        - If wildcards: ('regex', regex_pattern)
-    """
-    if not value:
-        return ('exact', value)
-
-    if '*' in value or '?' in value:
-
-        import re
-        pattern = value.replace('*', '.*').replace('?', '.')
-        pattern = f'^{pattern}$'
-        return ('iregex', pattern)
-    else:
-        return ('iexact', value)
+# Closes each query's log output; emitted with the summary as one record
+_SEPARATOR = '=' * 60
 
 
 class StudyQueryHandler:
@@ -65,120 +42,132 @@ class StudyQueryHandler:
         """
         logger.info("📚 Processing STUDY level C-FIND - Querying API")
 
-        filters = {}
+        # Query keys are read from the dataset once and reused for logging,
+        # the API filters and matching
+        criteria = self._build_match_criteria(query_ds)
 
-        if hasattr(query_ds, 'PatientID') and query_ds.PatientID:
-            patient_id_value = str(query_ds.PatientID)
-            anonymized_id = self.resolver.resolve_to_anonymous(original_id=patient_id_value)
-            if anonymized_id:
-                lookup_type, lookup_value = dicom_wildcard_to_django(anonymized_id)
-                filters[f'patient_id__{lookup_type}'] = lookup_value
-                logger.info(f"Filtering by Patient ID: {patient_id_value} (anonymized: {anonymized_id})")
-            else:
-                lookup_type, lookup_value = dicom_wildcard_to_django(patient_id_value)
-                filters[f'patient_id__{lookup_type}'] = lookup_value
-                logger.info(f"Filtering by Patient ID: {patient_id_value}")
-
-        if hasattr(query_ds, 'PatientName') and query_ds.PatientName:
-            patient_name_value = str(query_ds.PatientName)
-            anonymized_name = self.resolver.resolve_to_anonymous(original_name=patient_name_value)
-            if anonymized_name:
-                lookup_type, lookup_value = dicom_wildcard_to_django(anonymized_name)
-                filters[f'patient_name__{lookup_type}'] = lookup_value
-                logger.info(f"Filtering by Patient Name: {patient_name_value} (anonymized: {anonymized_name})")
-            else:
-                lookup_type, lookup_value = dicom_wildcard_to_django(patient_name_value)
-                filters[f'patient_name__{lookup_type}'] = lookup_value
-                logger.info(f"Filtering by Patient Name: {patient_name_value}")
+        if 'PatientID' in criteria:
+            logger.info(f"Filtering by Patient ID: {criteria['PatientID']}")
+
+        if 'PatientName' in criteria:
+            logger.info(f"Filtering by Patient Name: {criteria['PatientName']}")
 
-        if hasattr(query_ds, 'StudyInstanceUID') and query_ds.StudyInstanceUID:
-            filters['study_instance_uid'] = query_ds.StudyInstanceUID
-            logger.info(f"Filtering by Study UID: {query_ds.StudyInstanceUID}")
+        if 'StudyInstanceUID' in criteria:
+            logger.info(f"Filtering by Study UID: {criteria['StudyInstanceUID']}")
 
-        if hasattr(query_ds, 'StudyDate') and query_ds.StudyDate:
-            study_date = query_ds.StudyDate
+        study_date = criteria.get('StudyDate')
+        if study_date:
             if '-' in study_date:
-                start_date, end_date = study_date.split('-')
-                if start_date:
-                    filters['study_date__gte'] = start_date
-                if end_date:
-                    filters['study_date__lte'] = end_date
                 logger.info(f"Filtering by Study Date range: {study_date}")
             else:
-                filters['study_date'] = study_date
                 logger.info(f"Filtering by Study Date: {study_date}")
 
-        if hasattr(query_ds, 'AccessionNumber') and query_ds.AccessionNumber:
-            filters['accession_number'] = query_ds.AccessionNumber
-            logger.info(f"Filtering by Accession Number: {query_ds.AccessionNumber}")
+        if 'AccessionNumber' in criteria:
+            logger.info(f"Filtering by Accession Number: {criteria['AccessionNumber']}")
 
         if self.api_query_service:
             logger.info("🌐 Querying ITH API for studies...")
             try:
-                api_studies = self.api_query_service.query_all_studies()
+                # Study-level keys are filtered by the API; patient keys hold
+                # original values and are matched after resolution below
+                api_studies = self.api_query_service.query_studies(
+                    study_instance_uid=criteria.get('StudyInstanceUID'),
+                    accession_number=criteria.get('AccessionNumber')
+                )
                 if api_studies:
                     logger.info(f" Found {len(api_studies)} studies from API")
                     response_count = 0
-                    for study_info in api_studies:
-                        if not self._matches_filters(study_info, query_ds):
-                            continue
-
+                    # A query without keys lists everything; no per-study check
+                    matching_studies = [
+                        study_info for study_info in api_studies
+                        if self._matches_filters(study_info, criteria)
+                    ] if criteria else api_studies
+
+                    # One mapping query for all patients; studies of the same
+                    # patient share one entry
+                    resolved_patients = self.resolver.resolve_patients_bulk(
+                        (study_info.get('PatientName', ''), study_info.get('PatientID', ''))
+                        for study_info in matching_studies
+                    )
+
+                    # PHI metadata is only restored for patients with a local session
+                    names_with_sessions = self._get_names_with_sessions({
+                        original_info['anonymous_name']
+                        for original_info in resolved_patients.values() if original_info
+                    })
+
+                    for study_info in matching_studies:
+                        # Elements are written by tag, skipping the keyword
+                        # and VR dictionary lookups of attribute assignment
                         response_ds = Dataset()
-                        response_ds.QueryRetrieveLevel = 'STUDY'
+                        response_ds[0x00080052] = DataElement(0x00080052, 'CS', 'STUDY')
 
                         anonymous_patient_name = study_info.get('PatientName', '')
                         anonymous_patient_id = study_info.get('PatientID', '')
 
-                        original_info = self.resolver.resolve_patient(
-                            anonymous_name=anonymous_patient_name,
-                            anonymous_id=anonymous_patient_id
+                        original_info = resolved_patients[(anonymous_patient_name, anonymous_patient_id)]
+                        phi_metadata = (
+                            original_info['phi_metadata']
+                            if original_info and original_info['anonymous_name'] in names_with_sessions
+                            else {}
                         )
 
                         if original_info:
-                            response_ds.PatientName = original_info['original_name']
-                            response_ds.PatientID = original_info['original_id']
-                            logger.debug(f"De-anonymized: {anonymous_patient_name} → {original_info['original_name']}")
+                            patient_name = original_info['original_name']
+                            patient_id = original_info['original_id']
+                            logger.debug("De-anonymized: %s → %s", anonymous_patient_name, patient_name)
 
-                            phi_metadata = self._get_phi_metadata(original_info['anonymous_name'])
                             if phi_metadata:
-                                logger.debug(f"Restoring {len(phi_metadata)} PHI fields")
+                                logger.debug("Restoring %d PHI fields", len(phi_metadata))
                         else:
-                            response_ds.PatientName = anonymous_patient_name
-                            response_ds.PatientID = anonymous_patient_id
-                            logger.warning(f"No mapping found for {anonymous_patient_name}, using as-is")
-                            phi_metadata = {}
-
-                        response_ds.StudyInstanceUID = study_info.get('StudyInstanceUID', '')
-
-                        response_ds.StudyDescription = phi_metadata.get('StudyDescription', study_info.get('StudyDescription', ''))
-                        response_ds.StudyDate = phi_metadata.get('StudyDate', study_info.get('StudyDate', ''))
-                        response_ds.StudyTime = phi_metadata.get('StudyTime', study_info.get('StudyTime', ''))
-                        response_ds.AccessionNumber = study_info.get('AccessionNumber', '')
+                            patient_name = anonymous_patient_name
+                            patient_id = anonymous_patient_id
+                            logger.warning("No mapping found for %s, using as-is", anonymous_patient_name)
+
+                        study_description = phi_metadata.get('StudyDescription', study_info.get('StudyDescription', ''))
+                        study_date = phi_metadata.get('StudyDate', study_info.get('StudyDate', ''))
+
+                        response_ds[0x00100010] = DataElement(0x00100010, 'PN', patient_name)
+                        response_ds[0x00100020] = DataElement(0x00100020, 'LO', patient_id)
+                        response_ds[0x0020000D] = DataElement(0x0020000D, 'UI', study_info.get('StudyInstanceUID', ''))
+                        response_ds[0x00081030] = DataElement(0x00081030, 'LO', study_description)
+                        response_ds[0x00080020] = DataElement(0x00080020, 'DA', study_date)
+                        response_ds[0x00080030] = DataElement(
+                            0x00080030, 'TM', phi_metadata.get('StudyTime', study_info.get('StudyTime', ''))
+                        )
+                        response_ds[0x00080050] = DataElement(0x00080050, 'SH', study_info.get('AccessionNumber', ''))
 
                         birth_date = phi_metadata.get('PatientBirthDate') or study_info.get('PatientBirthDate')
                         if birth_date:
-                            response_ds.PatientBirthDate = birth_date
+                            response_ds[0x00100030] = DataElement(0x00100030, 'DA', birth_date)
 
                         patient_sex = study_info.get('PatientSex')
                         if patient_sex:
-                            response_ds.PatientSex = patient_sex
+                            response_ds[0x00100040] = DataElement(0x00100040, 'CS', patient_sex)
 
                         if study_info.get('NumberOfStudyRelatedSeries'):
-                            response_ds.NumberOfStudyRelatedSeries = study_info['NumberOfStudyRelatedSeries']
+                            response_ds[0x00201206] = DataElement(
+                                0x00201206, 'IS', study_info['NumberOfStudyRelatedSeries']
+                            )
                         if study_info.get('NumberOfStudyRelatedInstances'):
-                            response_ds.NumberOfStudyRelatedInstances = study_info['NumberOfStudyRelatedInstances']
-
-                        logger.info(f"Returning study #{response_count + 1}:")
-                        logger.info(f"Patient: {response_ds.PatientName} (ID: {response_ds.PatientID})")
-                        logger.info(f"Study: {response_ds.StudyDescription or 'No Description'}")
-                        logger.info(f" Date: {response_ds.StudyDate or 'Unknown'}")
-                        logger.info(f"UID: {response_ds.StudyInstanceUID}")
+                            response_ds[0x00201208] = DataElement(
+                                0x00201208, 'IS', study_info['NumberOfStudyRelatedInstances']
+                            )
+
+                        logger.info(
+                            "Returning study #%d: %s (ID: %s), %s, date %s, UID %s",
+                            response_count + 1,
+                            patient_name,
+                            patient_id,
+                            study_description or 'No Description',
+                            study_date or 'Unknown',
+                            study_info.get('StudyInstanceUID', '')
+                        )
 
                         response_count += 1
                         yield 0xFF00, response_ds
 
-                    logger.info(f"STUDY query completed (API) - returned {response_count} studies")
-                    logger.info("=" * 60)
+                    logger.info("STUDY query completed (API) - returned %d studies\n%s", response_count, _SEPARATOR)
                     yield 0x0000, None
                     return
                 else:
@@ -188,77 +177,90 @@ class StudyQueryHandler:
         else:
             logger.warning("API query service not available - cannot query studies")
 
-        logger.info("=" * 60)
-        logger.info("STUDY query completed - 0 results (API only mode)")
-        logger.info("=" * 60)
+        logger.info("%s\nSTUDY query completed - 0 results (API only mode)\n%s", _SEPARATOR, _SEPARATOR)
         yield 0x0000, None 
 
-    def _get_phi_metadata(self, anonymous_name: str) -> Dict[str, str]:
+    def _get_names_with_sessions(self, anonymous_names: Set[str]) -> Set[str]:
         """
-        Get stored PHI metadata for a patient.
+        Find which patients have a local session, in a single query.
 
         Args:
-            anonymous_name: Anonymous patient name
+            anonymous_names: Anonymous patient names
 
         Returns:
-            Dict of PHI metadata
+            The subset of names with at least one session
         """
+        if not anonymous_names:
+            return set()
+
         try:
-            mapping = Session.objects.filter(
-                patient_name=anonymous_name
-            ).first()
-
-            if mapping:
-                from receiver.models import PatientMapping
-                patient_mapping = PatientMapping.objects.filter(
-                    anonymous_patient_name=anonymous_name
-                ).first()
-
-                if patient_mapping:
-                    return patient_mapping.get_phi_metadata()
+            # order_by() drops the default ordering so DISTINCT applies to names only
+            return set(
+                Session.objects.filter(patient_name__in=anonymous_names)
+                .order_by()
+                .values_list('patient_name', flat=True)
+                .distinct()
+            )
         except Exception as e:
             logger.warning(f"Could not retrieve PHI metadata: {e}")
 
-        return {}
+        return set()
 
-    def _matches_filters(self, study_info: Dict[str, str], query_ds) -> bool:
+    # Keys matched by exact value against the API study info
+    EXACT_MATCH_KEYS = ('PatientID', 'PatientName', 'StudyInstanceUID', 'AccessionNumber')
+
+    def _build_match_criteria(self, query_ds) -> Dict[str, Any]:
+        """
+        Read the matching keys from the query once per C-FIND.
+
+        Values are converted to str here, so PatientName is formatted once
+        rather than once per candidate study. A StudyDate range is also
+        split here, into a (start, end) tuple under 'StudyDateRange'.
+
+        Args:
+            query_ds: Query dataset with filter criteria
+
+        Returns:
+            Dict of keyword to non-empty query value
+        """
+        criteria = {}
+        for keyword in (*self.EXACT_MATCH_KEYS, 'StudyDate'):
+            value = getattr(query_ds, keyword, None)
+            if value:
+                criteria[keyword] = str(value)
+
+        study_date = criteria.get('StudyDate')
+        if study_date and '-' in study_date:
+            start_date, _, end_date = study_date.partition('-')
+            criteria['StudyDateRange'] = (start_date, end_date)
+        return criteria
+
+    def _matches_filters(self, study_info: Dict[str, str], criteria: Dict[str, Any]) -> bool:
         """
         Check if study info from API matches the query filters.
 
         Args:
             study_info: Study information dictionary from API
-            query_ds: Query dataset with filter criteria
+            criteria: Query values from _build_match_criteria
 
         Returns:
             bool: True if matches all filters
         """
-        if hasattr(query_ds, 'PatientID') and query_ds.PatientID:
-            if study_info.get('PatientID') != str(query_ds.PatientID):
+        for keyword in self.EXACT_MATCH_KEYS:
+            expected = criteria.get(keyword)
+            if expected and study_info.get(keyword) != expected:
                 return False
 
-        if hasattr(query_ds, 'PatientName') and query_ds.PatientName:
-            if study_info.get('PatientName') != str(query_ds.PatientName):
+        date_range = criteria.get('StudyDateRange')
+        if date_range:
+            start_date, end_date = date_range
+            study_info_date = study_info.get('StudyDate', '')
+            if start_date and study_info_date < start_date:
                 return False
-
-        if hasattr(query_ds, 'StudyInstanceUID') and query_ds.StudyInstanceUID:
-            if study_info.get('StudyInstanceUID') != query_ds.StudyInstanceUID:
+            if end_date and study_info_date > end_date:
                 return False
-
-        if hasattr(query_ds, 'StudyDate') and query_ds.StudyDate:
-            study_date = query_ds.StudyDate
-            if '-' in study_date:
-                start_date, end_date = study_date.split('-')
-                study_info_date = study_info.get('StudyDate', '')
-                if start_date and study_info_date < start_date:
-                    return False
-                if end_date and study_info_date > end_date:
-                    return False
-            else:
-                if study_info.get('StudyDate') != study_date:
-                    return False
-
-        if hasattr(query_ds, 'AccessionNumber') and query_ds.AccessionNumber:
-            if study_info.get('AccessionNumber') != query_ds.AccessionNumber:
+        elif 'StudyDate' in criteria:
+            if study_info.get('StudyDate') != criteria['StudyDate']:
                 return False
 
         return True
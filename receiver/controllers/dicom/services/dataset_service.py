@@ -6,11 +6,44 @@ Handles transfer syntax, file meta information, and other dataset preparation.
 import logging
 from typing import Any
 
-import pydicom
-from pydicom.uid import PYDICOM_IMPLEMENTATION_UID, ImplicitVRLittleEndian, ExplicitVRLittleEndian
+from pydicom.dataelem import DataElement
+from pydicom.dataset import FileMetaDataset
+from pydicom.pixel_data_handlers import pylibjpeg_handler
+from pydicom.uid import (
+    PYDICOM_IMPLEMENTATION_UID,
+    ImplicitVRLittleEndian,
+    ExplicitVRLittleEndian,
+    ExplicitVRBigEndian,
+    DeflatedExplicitVRLittleEndian,
+)
 
 logger = logging.getLogger('receiver.services.dataset')
 
+# Syntaxes whose pixel data is stored natively (not encapsulated)
+NATIVE_TRANSFER_SYNTAXES = frozenset({
+    ImplicitVRLittleEndian,
+    ExplicitVRLittleEndian,
+    ExplicitVRBigEndian,
+    DeflatedExplicitVRLittleEndian,
+})
+
+# (is_little_endian, is_implicit_VR) per syntax; every other syntax,
+# compressed ones included, is explicit VR little endian
+_TRANSFER_SYNTAX_ENCODING = {
+    ImplicitVRLittleEndian: (True, True),
+    ExplicitVRBigEndian: (False, False),
+}
+_DEFAULT_ENCODING = (True, False)
+
+
+def _build_file_meta_template() -> FileMetaDataset:
+    """Build the file meta elements that are identical for every dataset."""
+    template = FileMetaDataset()
+    template.FileMetaInformationVersion = b'\x00\x01'
+    template.ImplementationClassUID = PYDICOM_IMPLEMENTATION_UID
+    template.ImplementationVersionName = "PYDICOM"
+    return template
+
 
 class DICOMDatasetService:
     """
@@ -22,6 +55,13 @@ class DICOMDatasetService:
     - Ensuring required DICOM attributes are present
     """
 
+    # Static file meta elements, resolved to tag/VR once at import
+    _FILE_META_TEMPLATE = _build_file_meta_template()
+
+    # Run pydicom's file meta validation after preparing. Off by default:
+    # prepare_dataset writes every element fix_meta_info would set or check
+    VALIDATE_META = False
+
     @staticmethod
     def prepare_dataset(dataset: Any, transfer_syntax: str) -> None:
         """
@@ -34,38 +74,81 @@ class DICOMDatasetService:
         - Implementation class and version
         - Encoding properties (is_little_endian, is_implicit_VR)
 
+        Compressed pixel data is decompressed when the target syntax is
+        native, so the data matches the syntax it is labelled with. When
+        the archived syntax is kept, pixel data is passed through as-is.
+
         Args:
             dataset: DICOM dataset to prepare
             transfer_syntax: Transfer syntax UID
+
+        Raises:
+            Exception: If compressed pixel data cannot be decompressed
         """
+        DICOMDatasetService.decompress_for(dataset, transfer_syntax)
+
         try:
             # Set transfer syntax encoding properties (pydicom 2.4.4)
-            dataset.is_little_endian = transfer_syntax in [
-                ImplicitVRLittleEndian,
-                ExplicitVRLittleEndian
-            ]
-            dataset.is_implicit_VR = transfer_syntax == ImplicitVRLittleEndian
+            dataset.is_little_endian, dataset.is_implicit_VR = _TRANSFER_SYNTAX_ENCODING.get(
+                transfer_syntax, _DEFAULT_ENCODING
+            )
 
             # Create file_meta if it doesn't exist
-            if not hasattr(dataset, 'file_meta') or dataset.file_meta is None:
-                dataset.file_meta = pydicom.dataset.FileMetaDataset()
-
-            # Set required file meta elements
-            dataset.file_meta.MediaStorageSOPClassUID = dataset.SOPClassUID
-            dataset.file_meta.MediaStorageSOPInstanceUID = dataset.SOPInstanceUID
-            dataset.file_meta.TransferSyntaxUID = transfer_syntax
-            dataset.file_meta.ImplementationClassUID = PYDICOM_IMPLEMENTATION_UID
-            dataset.file_meta.ImplementationVersionName = "PYDICOM"
-            dataset.file_meta.FileMetaInformationVersion = b'\x00\x01'
-
-            # Validate and fix file meta information (pydicom 2.4.4)
-            dataset.fix_meta_info(enforce_standard=True)
+            file_meta = getattr(dataset, 'file_meta', None)
+            if file_meta is None:
+                file_meta = dataset.file_meta = FileMetaDataset()
+
+            # All elements are written by tag, skipping the keyword and VR
+            # dictionary lookups of attribute assignment. Static ones come
+            # from the template; fresh DataElements so datasets never share
+            # (mutable) elements.
+            for elem in DICOMDatasetService._FILE_META_TEMPLATE:
+                file_meta[elem.tag] = DataElement(elem.tag, elem.VR, elem.value)
+
+            file_meta[0x00020002] = DataElement(0x00020002, 'UI', dataset.SOPClassUID)
+            file_meta[0x00020003] = DataElement(0x00020003, 'UI', dataset.SOPInstanceUID)
+            file_meta[0x00020010] = DataElement(0x00020010, 'UI', transfer_syntax)
+
+            # Only needed to catch foreign (non group 2) elements carried
+            # over in an existing file_meta
+            if DICOMDatasetService.VALIDATE_META:
+                dataset.fix_meta_info(enforce_standard=True)
 
             logger.debug(f"Prepared dataset with transfer syntax: {transfer_syntax}")
 
         except Exception as e:
             logger.warning(f"Error preparing dataset: {e}")
 
+    @staticmethod
+    def decompress_for(dataset: Any, transfer_syntax: str) -> bool:
+        """
+        Decompress encapsulated pixel data if the target syntax is native.
+
+        Uses pylibjpeg when installed, otherwise pydicom's default handler
+        search.
+
+        Args:
+            dataset: DICOM dataset
+            transfer_syntax: Target transfer syntax UID
+
+        Returns:
+            True if the dataset was decompressed
+        """
+        file_meta = getattr(dataset, 'file_meta', None)
+        source_syntax = file_meta.get('TransferSyntaxUID') if file_meta is not None else None
+
+        if (not source_syntax
+                or source_syntax == transfer_syntax
+                or source_syntax in NATIVE_TRANSFER_SYNTAXES
+                or transfer_syntax not in NATIVE_TRANSFER_SYNTAXES
+                or 0x7FE00010 not in dataset):
+            return False
+
+        handler_name = pylibjpeg_handler.HANDLER_NAME if pylibjpeg_handler.is_available() else ''
+        dataset.decompress(handler_name=handler_name)
+        logger.debug(f"Decompressed pixel data from {source_syntax} for {transfer_syntax}")
+        return True
+
     @staticmethod
     def validate_dataset(dataset: Any) -> bool:
         """
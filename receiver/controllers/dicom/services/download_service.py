@@ -3,13 +3,24 @@ Download service for retrieving DICOM datasets from the ITH API.
 
 Handles downloading at different query levels (STUDY, SERIES, IMAGE).
 """
+import io
 import logging
+import os
 import tempfile
+import threading
+import time
+import weakref
 import zipfile
-from pathlib import Path
-from typing import Any, Optional, TYPE_CHECKING
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
 
-from pydicom import dcmread
+from pydicom import Dataset, dcmread
+
+from receiver.utils.storage import open_zip_member
 
 if TYPE_CHECKING:
     from receiver.controllers.phi import PHIResolver
@@ -17,6 +28,151 @@ if TYPE_CHECKING:
 logger = logging.getLogger('receiver.services.download')
 
 
+class DICOMDatasetStream:
+    """
+    Datasets from a downloaded API archive, loaded lazily on iteration.
+
+    Only the archive member list is known up front, so len() is available
+    for the sub-operation count while each member is read, parsed and
+    resolved when it is reached. The owner must call close() once the
+    datasets have been sent to release the archive; a stream that is
+    garbage collected unclosed is closed then.
+
+    Members are loaded on a thread pool with at most max_workers loads in
+    flight; datasets are still yielded in archive order. process_func runs
+    on the iterating thread, so database work (PHI resolution) never
+    happens on the pool threads, which would each open a connection.
+    """
+
+    def __init__(
+        self,
+        resources: ExitStack,
+        members: List[Any],
+        load_func: Callable[[Any], Optional[Dataset]],
+        max_workers: int = 1,
+        process_func: Optional[Callable[[Dataset], Optional[Dataset]]] = None
+    ):
+        """
+        Initialize dataset stream.
+
+        Args:
+            resources: Open archive and its buffer, closed by close()
+            members: Archive members holding the DICOM files
+            load_func: Function loading one member, returns None on failure
+            max_workers: Number of members loaded concurrently
+            process_func: Function applied to each loaded dataset on the
+                iterating thread, returns None on failure
+        """
+        self._members = members
+        self._load_func = load_func
+        self._max_workers = max_workers
+        self._process_func = process_func
+
+        # Backstop for streams that are dropped without close(), so a shared
+        # archive is not pinned for its other readers; runs at most once
+        self._close = weakref.finalize(self, resources.close)
+
+    @classmethod
+    def from_datasets(cls, datasets: List[Dataset]) -> 'DICOMDatasetStream':
+        """
+        Wrap datasets that are already loaded, possibly none, in a stream.
+
+        Args:
+            datasets: Loaded datasets
+
+        Returns:
+            Stream yielding the datasets, with nothing to release
+        """
+        return cls(ExitStack(), datasets, lambda ds: ds)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self) -> Iterator[Dataset]:
+        for ds in self._iter_loaded():
+            if self._process_func is not None:
+                ds = self._process_func(ds)
+            if ds is not None:
+                yield ds
+
+    def _iter_loaded(self) -> Iterator[Dataset]:
+        """Yield the loaded members in archive order, skipping failures."""
+        if self._max_workers <= 1 or len(self._members) <= 1:
+            for member in self._members:
+                ds = self._load_func(member)
+                if ds is not None:
+                    yield ds
+            return
+
+        with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='dicom-load') as executor:
+            members = iter(self._members)
+            pending = deque(executor.submit(self._load_func, member)
+                            for member in islice(members, self._max_workers))
+            try:
+                while pending:
+                    ds = pending.popleft().result()
+                    next_member = next(members, None)
+                    if next_member is not None:
+                        pending.append(executor.submit(self._load_func, next_member))
+                    if ds is not None:
+                        yield ds
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def close(self) -> None:
+        """Close the archive and release its buffer. Safe to call repeatedly."""
+        self._close()
+
+
+class _SharedArchive:
+    """
+    A downloaded archive read by several dataset streams at once.
+
+    Each stream releases its reference when closed; the archive and its
+    buffer are closed with the last one. Reads from the archive are
+    thread safe, so the streams do not need to coordinate otherwise.
+    """
+
+    def __init__(
+        self,
+        resources: ExitStack,
+        zip_ref: zipfile.ZipFile,
+        members: List[zipfile.ZipInfo],
+        refs: int
+    ):
+        """
+        Initialize shared archive.
+
+        Args:
+            resources: Open archive and its buffer
+            zip_ref: Open archive
+            members: DICOM members of the archive
+            refs: Number of streams that will read the archive
+        """
+        self.zip_ref = zip_ref
+        self.members = members
+        self._resources = resources
+        self._refs = refs
+        self._lock = threading.Lock()
+
+    def release(self) -> None:
+        """Drop one reference, closing the archive after the last."""
+        with self._lock:
+            self._refs -= 1
+            if self._refs > 0:
+                return
+        self._resources.close()
+
+
+class _InFlightDownload:
+    """An archive download, with the number of requests waiting for it."""
+
+    def __init__(self):
+        self.future: Future = Future()
+        self.requests = 1
+
+
 class DICOMDownloadService:
     """
     Service for downloading DICOM datasets from ITH API.
@@ -28,6 +184,26 @@ class DICOMDownloadService:
     - Lock management to prevent duplicate downloads
     """
 
+    # Archives up to this size are buffered in memory, larger ones spill to disk
+    SPOOL_MAX_SIZE = 256 * 1024 * 1024
+
+    # Tags needed to pick an instance without parsing the whole file
+    IMAGE_FILTER_TAGS = ['SOPInstanceUID']
+
+    # Concurrent file loads per stream; reading and parsing is mostly I/O
+    LOAD_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+    # Seconds a study's session lookup is reused before being refetched
+    SESSION_CACHE_TTL = 30
+
+    # Read buffer put in front of archive members, so pydicom's many small
+    # element reads are not each served by the archive's shared file
+    MEMBER_READ_BUFFER_SIZE = 256 * 1024
+
+    # Deflated members above this size are read unbuffered; the extra copy
+    # of their pixel data costs more than the buffer saves
+    BUFFERED_DEFLATED_MAX_SIZE = 1024 * 1024
+
     def __init__(
         self,
         api_client: Any,
@@ -37,6 +213,11 @@ class DICOMDownloadService:
         """
         Initialize download service.
 
+        Each retrieve makes several API calls in a row (session lookup,
+        scan list, archive download), so api_client is expected to be the
+        shared IthAPIClient, whose pooled requests session keeps
+        connections alive between them.
+
         Args:
             api_client: ITH API client for making requests
             resolver: PHIResolver for de-anonymization
@@ -46,57 +227,58 @@ class DICOMDownloadService:
         self.resolver = resolver
         self.lock_manager = lock_manager
 
+        self._sessions_by_study: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._sessions_lock = threading.Lock()
+
+        # Archive downloads in progress, shared by identical requests
+        self._inflight: Dict[Tuple[str, str], _InFlightDownload] = {}
+        self._inflight_lock = threading.Lock()
+
     def download_study(
         self,
         study_uid: str,
-        transfer_syntax: str,
-        prepare_dataset_func: Any
-    ) -> list:
+        transfer_syntax: Optional[str] = None,
+        prepare_dataset_func: Optional[Callable[[Dataset, str], None]] = None
+    ) -> DICOMDatasetStream:
         """
         Download all datasets for a study.
 
         Args:
             study_uid: Study Instance UID
-            transfer_syntax: Transfer syntax to use
-            prepare_dataset_func: Function to prepare each dataset
+            transfer_syntax: Transfer syntax passed to prepare_dataset_func
+            prepare_dataset_func: Function to prepare each dataset; datasets
+                keep their archived encoding if None
 
         Returns:
-            List of DICOM datasets
+            Stream of DICOM datasets, empty if not found; the caller
+            must close it
         """
-        datasets = []
+        datasets = DICOMDatasetStream.from_datasets([])
 
         try:
             logger.info(f"Searching for study {study_uid} in API sessions...")
-            sessions_response = self.api_client.list_sessions()
-            sessions = sessions_response.get('sessions', [])
-            logger.info(f"Found {len(sessions)} sessions in API")
-
-            matched = False
-            for session in sessions:
-                session_study_uid = session.get('study_instance_uid')
-                if session_study_uid == study_uid:
-                    matched = True
-                    session_id = session.get('session_id')
-                    subject_id = session.get('subject_id')
-                    logger.info(f"Matched session {session_id} with study UID {study_uid}")
-
-                    if session_id and subject_id:
-                        datasets = self._download_session(
-                            session_id,
-                            subject_id,
-                            study_uid,
-                            transfer_syntax,
-                            prepare_dataset_func,
-                            lock_key='c-get'
-                        )
-                    break
-
-            if not matched:
+            session = self._find_session(study_uid)
+
+            if session:
+                session_id = session.get('session_id')
+                subject_id = session.get('subject_id')
+                logger.info(f"Matched session {session_id} with study UID {study_uid}")
+
+                datasets = self._download_session(
+                    session_id,
+                    subject_id,
+                    study_uid,
+                    transfer_syntax,
+                    prepare_dataset_func,
+                    lock_key='c-get'
+                )
+            else:
                 logger.warning(f"No session found in API with StudyInstanceUID: {study_uid}")
-                logger.warning(f"Available study UIDs: {[s.get('study_instance_uid') for s in sessions[:5]]}")
 
         except Exception as e:
             logger.error(f"Error downloading study: {e}", exc_info=True)
+            # The cached session may be gone (e.g. deleted); look it up again next time
+            self.invalidate_session(study_uid)
 
         return datasets
 
@@ -104,64 +286,49 @@ class DICOMDownloadService:
         self,
         study_uid: str,
         series_uid: str,
-        transfer_syntax: str,
-        prepare_dataset_func: Any
-    ) -> list:
+        transfer_syntax: Optional[str] = None,
+        prepare_dataset_func: Optional[Callable[[Dataset, str], None]] = None
+    ) -> DICOMDatasetStream:
         """
         Download all datasets for a series.
 
         Args:
             study_uid: Study Instance UID
             series_uid: Series Instance UID
-            transfer_syntax: Transfer syntax to use
-            prepare_dataset_func: Function to prepare each dataset
+            transfer_syntax: Transfer syntax passed to prepare_dataset_func
+            prepare_dataset_func: Function to prepare each dataset; datasets
+                keep their archived encoding if None
 
         Returns:
-            List of DICOM datasets
+            Stream of DICOM datasets, empty if not found; the caller
+            must close it
         """
-        datasets = []
+        datasets = DICOMDatasetStream.from_datasets([])
 
         try:
-            sessions_response = self.api_client.list_sessions()
-            sessions = sessions_response.get('sessions', [])
-
-            for session in sessions:
-                if session.get('study_instance_uid') == study_uid:
-                    session_id = session.get('session_id')
-                    subject_id = session.get('subject_id')
-
-                    if not session_id or not subject_id:
-                        continue
-
-                    logger.debug(f"Finding scan with SeriesInstanceUID {series_uid}")
-                    scans_response = self.api_client.list_scans(subject_id, session_id)
-                    scans = scans_response.get('scans', [])
-
-                    matching_scan = None
-                    for scan in scans:
-                        if scan.get('series_instance_uid') == series_uid:
-                            matching_scan = scan
-                            break
-
-                    if not matching_scan:
-                        logger.warning(f"No scan found with SeriesInstanceUID {series_uid}")
-                        break
-
-                    scan_id = matching_scan.get('id')
-                    logger.info(f"Found matching scan: {scan_id}")
-
-                    datasets = self._download_scan(
-                        scan_id,
-                        session_id,
-                        subject_id,
-                        series_uid,
-                        transfer_syntax,
-                        prepare_dataset_func
-                    )
-                    break
+            session = self._find_session(study_uid)
+
+            if session:
+                session_id = session.get('session_id')
+                subject_id = session.get('subject_id')
+
+                scan_id = self._find_scan_id(session_id, subject_id, series_uid)
+                if not scan_id:
+                    return datasets
+
+                datasets = self._download_scan(
+                    scan_id,
+                    session_id,
+                    subject_id,
+                    series_uid,
+                    transfer_syntax,
+                    prepare_dataset_func
+                )
 
         except Exception as e:
             logger.error(f"Error downloading series: {e}", exc_info=True)
+            # The cached session may be gone (e.g. deleted); look it up again next time
+            self.invalidate_session(study_uid)
 
         return datasets
 
@@ -170,9 +337,9 @@ class DICOMDownloadService:
         study_uid: str,
         series_uid: str,
         sop_uid: str,
-        transfer_syntax: str,
-        prepare_dataset_func: Any
-    ) -> list:
+        transfer_syntax: Optional[str] = None,
+        prepare_dataset_func: Optional[Callable[[Dataset, str], None]] = None
+    ) -> DICOMDatasetStream:
         """
         Download a specific image.
 
@@ -180,192 +347,495 @@ class DICOMDownloadService:
             study_uid: Study Instance UID
             series_uid: Series Instance UID
             sop_uid: SOP Instance UID
-            transfer_syntax: Transfer syntax to use
-            prepare_dataset_func: Function to prepare each dataset
+            transfer_syntax: Transfer syntax passed to prepare_dataset_func
+            prepare_dataset_func: Function to prepare each dataset; datasets
+                keep their archived encoding if None
 
         Returns:
-            List containing single DICOM dataset
+            Stream holding the DICOM dataset, empty if not found; the
+            caller must close it
         """
         datasets = []
 
         try:
-            sessions_response = self.api_client.list_sessions()
-            sessions = sessions_response.get('sessions', [])
-
-            for session in sessions:
-                if session.get('study_instance_uid') == study_uid:
-                    session_id = session.get('session_id')
-                    subject_id = session.get('subject_id')
-
-                    if session_id and subject_id:
-                        lock_acquired = self._acquire_lock('api_download', 'c-get-image', sop_uid)
-
-                        try:
-                            with tempfile.TemporaryDirectory() as temp_dir:
-                                temp_path = Path(temp_dir) / f"{session_id}.zip"
-
-                                logger.info(f"Downloading session {session_id} for image {sop_uid}...")
-                                self.api_client.download_session(
-                                    session_id=session_id,
-                                    subject_id=subject_id,
-                                    output_path=temp_path
-                                )
-
-                                extract_dir = Path(temp_dir) / "extracted"
-                                with zipfile.ZipFile(temp_path, 'r') as zip_ref:
-                                    zip_ref.extractall(extract_dir)
-
-                                for dcm_file in extract_dir.rglob('*.dcm'):
-                                    try:
-                                        ds = dcmread(str(dcm_file))
-                                        if (getattr(ds, 'SeriesInstanceUID', None) == series_uid and
-                                            getattr(ds, 'SOPInstanceUID', None) == sop_uid):
-                                            ds = self.resolver.resolve_dataset(ds)
-                                            prepare_dataset_func(ds, transfer_syntax)
-                                            datasets.append(ds)
-                                            break
-                                    except Exception as e:
-                                        logger.warning(f"Error reading {dcm_file}: {e}")
+            session = self._find_session(study_uid)
+
+            if session:
+                session_id = session.get('session_id')
+                subject_id = session.get('subject_id')
+
+                # Only the scan holding the series is downloaded, not the session
+                scan_id = self._find_scan_id(session_id, subject_id, series_uid)
+                if not scan_id:
+                    return DICOMDatasetStream.from_datasets(datasets)
+
+                lock_acquired = self._acquire_lock('api_download', 'c-get-image', sop_uid)
+
+                try:
+                    with tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE) as buffer:
+                        logger.info(f"Downloading scan {scan_id} for image {sop_uid}...")
+                        self.api_client.download_scan(
+                            scan_id=scan_id,
+                            subject_id=subject_id,
+                            session_id=session_id,
+                            output_path=buffer
+                        )
 
-                        finally:
-                            if lock_acquired:
-                                self._release_lock('api_download', 'c-get-image', sop_uid)
+                        with zipfile.ZipFile(buffer, 'r') as zip_ref:
+                            for info in self._list_dcm_members(zip_ref):
+                                try:
+                                    with self._open_member(zip_ref, info) as f:
+                                        header = dcmread(
+                                            f,
+                                            stop_before_pixels=True,
+                                            specific_tags=self.IMAGE_FILTER_TAGS
+                                        )
+                                    if getattr(header, 'SOPInstanceUID', None) == sop_uid:
+                                        with self._open_member(zip_ref, info) as f:
+                                            ds = dcmread(f)
+                                        ds = self.resolver.resolve_dataset(ds)
+                                        if prepare_dataset_func is not None:
+                                            prepare_dataset_func(ds, transfer_syntax)
+                                        datasets.append(ds)
+                                        break
+                                except Exception as e:
+                                    logger.warning(f"Error reading {info.filename}: {e}")
 
-                    break
+                finally:
+                    if lock_acquired:
+                        self._release_lock('api_download', 'c-get-image', sop_uid)
 
         except Exception as e:
             logger.error(f"Error downloading image: {e}", exc_info=True)
+            # The cached session may be gone (e.g. deleted); look it up again next time
+            self.invalidate_session(study_uid)
 
-        return datasets
+        return DICOMDatasetStream.from_datasets(datasets)
+
+    def _find_scan_id(self, session_id: str, subject_id: str, series_uid: str) -> Optional[str]:
+        """
+        Find the API scan holding a series.
+
+        Args:
+            session_id: Session ID
+            subject_id: Subject ID
+            series_uid: Series Instance UID
+
+        Returns:
+            Scan ID, or None if the session has no scan for the series
+        """
+        logger.debug(f"Finding scan with SeriesInstanceUID {series_uid}")
+        scans_response = self.api_client.list_scans(subject_id, session_id)
+
+        for scan in scans_response.get('scans', []):
+            if scan.get('series_instance_uid') == series_uid:
+                scan_id = scan.get('id')
+                logger.info(f"Found matching scan: {scan_id}")
+                return scan_id
+
+        logger.warning(f"No scan found with SeriesInstanceUID {series_uid}")
+        return None
+
+    def _find_session(self, study_uid: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the downloadable API session for a study.
+
+        Sessions are looked up per study with a server-side filter and
+        reused for SESSION_CACHE_TTL seconds. Misses are not cached, so
+        newly uploaded studies are found on the next request. Only
+        sessions with both a session and subject ID are used; the first
+        one wins.
+
+        Args:
+            study_uid: Study Instance UID
+
+        Returns:
+            Session dict, or None if no session has the study
+        """
+        with self._sessions_lock:
+            cached = self._sessions_by_study.get(study_uid)
+            if cached and time.monotonic() - cached[0] <= self.SESSION_CACHE_TTL:
+                return cached[1]
+
+        sessions = self.api_client.find_sessions_by_study_uid(study_uid)
+        logger.info(f"Found {len(sessions)} sessions in API for study {study_uid}")
+
+        session = next(
+            (s for s in sessions if s.get('session_id') and s.get('subject_id')),
+            None
+        )
+        if session is not None:
+            with self._sessions_lock:
+                now = time.monotonic()
+                self._sessions_by_study = {
+                    uid: entry for uid, entry in self._sessions_by_study.items()
+                    if now - entry[0] <= self.SESSION_CACHE_TTL
+                }
+                self._sessions_by_study[study_uid] = (now, session)
+
+        return session
+
+    def invalidate_session(self, study_uid: Optional[str] = None) -> None:
+        """
+        Drop cached session lookups so they are fetched again.
+
+        Args:
+            study_uid: Study Instance UID to drop, or None to drop all
+        """
+        with self._sessions_lock:
+            if study_uid is None:
+                self._sessions_by_study = {}
+            else:
+                self._sessions_by_study.pop(study_uid, None)
 
     def _download_session(
         self,
         session_id: str,
         subject_id: str,
         study_uid: str,
-        transfer_syntax: str,
-        prepare_dataset_func: Any,
+        transfer_syntax: Optional[str],
+        prepare_dataset_func: Optional[Callable[[Dataset, str], None]],
         lock_key: str
-    ) -> list:
+    ) -> DICOMDatasetStream:
         """
-        Download and extract all DICOM files from a session.
+        Download a session archive into memory and stream the DICOM files in it.
+
+        Requests for a session that is already being downloaded wait for
+        that download and read the same archive.
 
         Args:
             session_id: Session ID
             subject_id: Subject ID
             study_uid: Study UID for lock identification
-            transfer_syntax: Transfer syntax to use
-            prepare_dataset_func: Function to prepare each dataset
+            transfer_syntax: Transfer syntax passed to prepare_dataset_func
+            prepare_dataset_func: Function to prepare each dataset; datasets
+                keep their archived encoding if None
             lock_key: Lock key for preventing concurrent downloads
 
         Returns:
-            List of DICOM datasets
+            Stream of DICOM datasets, loaded on iteration
+        """
+        resources, zip_ref, members = self._download_shared(
+            ('session', session_id),
+            partial(self._fetch_session_archive, session_id, subject_id, study_uid, lock_key)
+        )
+        return self._stream_archive(resources, zip_ref, members, transfer_syntax, prepare_dataset_func)
+
+    def _download_scan(
+        self,
+        scan_id: str,
+        session_id: str,
+        subject_id: str,
+        series_uid: str,
+        transfer_syntax: Optional[str],
+        prepare_dataset_func: Optional[Callable[[Dataset, str], None]]
+    ) -> DICOMDatasetStream:
+        """
+        Download a scan archive into memory and stream the DICOM files in it.
+
+        Requests for a scan that is already being downloaded wait for that
+        download and read the same archive.
+
+        Args:
+            scan_id: Scan ID
+            session_id: Session ID
+            subject_id: Subject ID
+            series_uid: Series UID for lock identification
+            transfer_syntax: Transfer syntax passed to prepare_dataset_func
+            prepare_dataset_func: Function to prepare each dataset; datasets
+                keep their archived encoding if None
+
+        Returns:
+            Stream of DICOM datasets, loaded on iteration
+        """
+        resources, zip_ref, members = self._download_shared(
+            ('scan', scan_id),
+            partial(self._fetch_scan_archive, scan_id, session_id, subject_id, series_uid)
+        )
+        return self._stream_archive(resources, zip_ref, members, transfer_syntax, prepare_dataset_func)
+
+    def _download_shared(
+        self,
+        key: Tuple[str, str],
+        fetch_func: Callable[[], Tuple[ExitStack, zipfile.ZipFile, List[zipfile.ZipInfo]]]
+    ) -> Tuple[ExitStack, zipfile.ZipFile, List[zipfile.ZipInfo]]:
+        """
+        Fetch an archive, or join the identical download already in progress.
+
+        The first request runs fetch_func; requests arriving before it
+        finishes wait for its result instead of downloading again. Every
+        request gets its own resources, which release the shared archive
+        when closed.
+
+        Args:
+            key: Archive identity, e.g. ('scan', scan_id)
+            fetch_func: Function downloading and opening the archive
+
+        Returns:
+            Tuple of (resources, open archive, DICOM members)
+
+        Raises:
+            Exception: Whatever the download raised, in every waiting request
+        """
+        with self._inflight_lock:
+            inflight = self._inflight.get(key)
+            is_leader = inflight is None
+            if is_leader:
+                inflight = self._inflight[key] = _InFlightDownload()
+            else:
+                inflight.requests += 1
+
+        if is_leader:
+            try:
+                archive_resources, zip_ref, members = fetch_func()
+            except BaseException as e:
+                with self._inflight_lock:
+                    del self._inflight[key]
+                inflight.future.set_exception(e)
+                raise
+
+            # Removed under the lock, so no request joins after refs are counted
+            with self._inflight_lock:
+                del self._inflight[key]
+                archive = _SharedArchive(archive_resources, zip_ref, members, refs=inflight.requests)
+            inflight.future.set_result(archive)
+        else:
+            logger.info("Download of %s %s already in progress, sharing it", *key)
+            archive = inflight.future.result()
+
+        resources = ExitStack()
+        resources.callback(archive.release)
+        return resources, archive.zip_ref, archive.members
+
+    def _fetch_session_archive(
+        self,
+        session_id: str,
+        subject_id: str,
+        study_uid: str,
+        lock_key: str
+    ) -> Tuple[ExitStack, zipfile.ZipFile, List[zipfile.ZipInfo]]:
+        """
+        Download a session archive into a spooled buffer and open it.
+
+        Args:
+            session_id: Session ID
+            subject_id: Subject ID
+            study_uid: Study UID for lock identification
+            lock_key: Lock key for preventing concurrent downloads
+
+        Returns:
+            Tuple of (resources, open archive, DICOM members)
         """
-        datasets = []
         lock_acquired = self._acquire_lock('api_download', lock_key, study_uid)
+        resources = ExitStack()
 
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir) / f"{session_id}.zip"
-
-                logger.info(f"Downloading session {session_id} from API...")
-                self.api_client.download_session(
-                    session_id=session_id,
-                    subject_id=subject_id,
-                    output_path=temp_path
-                )
+            buffer = resources.enter_context(tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE))
+
+            logger.info(f"Downloading session {session_id} from API...")
+            self.api_client.download_session(
+                session_id=session_id,
+                subject_id=subject_id,
+                output_path=buffer
+            )
 
-                extract_dir = Path(temp_dir) / "extracted"
-                with zipfile.ZipFile(temp_path, 'r') as zip_ref:
-                    zip_ref.extractall(extract_dir)
+            zip_ref = resources.enter_context(zipfile.ZipFile(buffer, 'r'))
+            members = self._list_dcm_members(zip_ref)
 
-                for dcm_file in extract_dir.rglob('*.dcm'):
-                    try:
-                        ds = dcmread(str(dcm_file))
-                        ds = self.resolver.resolve_dataset(ds)
-                        prepare_dataset_func(ds, transfer_syntax)
-                        datasets.append(ds)
-                    except Exception as e:
-                        logger.warning(f"Error reading {dcm_file}: {e}")
+        except Exception:
+            resources.close()
+            raise
 
         finally:
             if lock_acquired:
                 self._release_lock('api_download', lock_key, study_uid)
 
-        return datasets
+        return resources, zip_ref, members
 
-    def _download_scan(
+    def _fetch_scan_archive(
         self,
         scan_id: str,
         session_id: str,
         subject_id: str,
-        series_uid: str,
-        transfer_syntax: str,
-        prepare_dataset_func: Any
-    ) -> list:
+        series_uid: str
+    ) -> Tuple[ExitStack, zipfile.ZipFile, List[zipfile.ZipInfo]]:
         """
-        Download and extract all DICOM files from a scan.
+        Download a scan archive into a spooled buffer and open it.
 
         Args:
             scan_id: Scan ID
             session_id: Session ID
             subject_id: Subject ID
             series_uid: Series UID for lock identification
-            transfer_syntax: Transfer syntax to use
-            prepare_dataset_func: Function to prepare each dataset
 
         Returns:
-            List of DICOM datasets
+            Tuple of (resources, open archive, DICOM members)
         """
-        datasets = []
         lock_acquired = self._acquire_lock('api_download', 'c-get-series', series_uid)
+        resources = ExitStack()
 
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir) / f"{scan_id}.zip"
-
-                logger.info(f"Downloading scan {scan_id} for series {series_uid}...")
-                self.api_client.download_scan(
-                    scan_id=scan_id,
-                    subject_id=subject_id,
-                    session_id=session_id,
-                    output_path=temp_path
-                )
+            buffer = resources.enter_context(tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE))
 
-                extract_dir = Path(temp_dir) / "extracted"
-                logger.debug(f"Extracting ZIP file...")
-                with zipfile.ZipFile(temp_path, 'r') as zip_ref:
-                    zip_ref.extractall(extract_dir)
+            logger.info(f"Downloading scan {scan_id} for series {series_uid}...")
+            self.api_client.download_scan(
+                scan_id=scan_id,
+                subject_id=subject_id,
+                session_id=session_id,
+                output_path=buffer
+            )
 
-                dcm_files = list(extract_dir.rglob('*.dcm'))
-                logger.info(f"Found {len(dcm_files)} DICOM files in scan")
+            zip_ref = resources.enter_context(zipfile.ZipFile(buffer, 'r'))
+            members = self._list_dcm_members(zip_ref)
+            logger.info(f"Found {len(members)} DICOM files in scan")
 
-                if not dcm_files:
-                    all_files = list(extract_dir.rglob('*'))
-                    logger.warning(f"No .dcm files found in archive. Files present: {[f.name for f in all_files[:10]]}")
+            if not members:
+                logger.warning(f"No .dcm files found in archive. Files present: {zip_ref.namelist()[:10]}")
 
-                for dcm_file in dcm_files:
-                    try:
-                        ds = dcmread(str(dcm_file))
-                        ds = self.resolver.resolve_dataset(ds)
-                        prepare_dataset_func(ds, transfer_syntax)
-                        datasets.append(ds)
-                        logger.debug(f"Loaded instance: {dcm_file.name}")
-                    except Exception as e:
-                        logger.error(f"Error reading {dcm_file}: {e}", exc_info=True)
-
-                logger.info(f"Successfully loaded {len(datasets)} DICOM instances from scan")
+        except Exception:
+            resources.close()
+            raise
 
         finally:
             if lock_acquired:
                 self._release_lock('api_download', 'c-get-series', series_uid)
 
-        return datasets
+        return resources, zip_ref, members
+
+    @staticmethod
+    def _list_dcm_members(zip_ref: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+        """
+        List the DICOM files in an archive from its central directory.
+
+        Args:
+            zip_ref: Open archive
+
+        Returns:
+            Archive members ending in .dcm
+        """
+        return [
+            info for info in zip_ref.infolist()
+            if not info.is_dir() and info.filename.endswith('.dcm')
+        ]
+
+    @classmethod
+    def _open_member(cls, zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo) -> io.BufferedIOBase:
+        """
+        Open an archive member for parsing, buffered when that is cheaper.
+
+        Deflated members are inflated with ISA-L when it is installed.
+
+        Args:
+            zip_ref: Open archive
+            info: Archive member
+
+        Returns:
+            Readable file object for the member
+        """
+        f = open_zip_member(zip_ref, info)
+        # ISA-L readers are raw streams, so they are always buffered
+        if (isinstance(f, io.RawIOBase)
+                or info.compress_type == zipfile.ZIP_STORED
+                or info.file_size <= cls.BUFFERED_DEFLATED_MAX_SIZE):
+            return io.BufferedReader(f, buffer_size=cls.MEMBER_READ_BUFFER_SIZE)
+        return f
+
+    def _stream_archive(
+        self,
+        resources: ExitStack,
+        zip_ref: zipfile.ZipFile,
+        members: List[zipfile.ZipInfo],
+        transfer_syntax: Optional[str],
+        prepare_dataset_func: Optional[Callable[[Dataset, str], None]]
+    ) -> DICOMDatasetStream:
+        """
+        Wrap archive members in a lazily loading dataset stream.
+
+        Args:
+            resources: Open archive and its buffer
+            zip_ref: Open archive
+            members: DICOM members of the archive
+            transfer_syntax: Transfer syntax passed to prepare_dataset_func
+            prepare_dataset_func: Function to prepare each dataset; datasets
+                keep their archived encoding if None
+
+        Returns:
+            Stream of DICOM datasets
+        """
+        # Instances of an archive share their patient, so PHI lookups are
+        # cached for the lifetime of the stream
+        process_func = partial(
+            self._resolve_and_prepare,
+            transfer_syntax=transfer_syntax,
+            prepare_dataset_func=prepare_dataset_func,
+            phi_cache={}
+        )
+        return DICOMDatasetStream(
+            resources,
+            members,
+            partial(self._load_member, zip_ref=zip_ref),
+            max_workers=self.LOAD_WORKERS,
+            process_func=process_func
+        )
+
+    def _load_member(self, info: zipfile.ZipInfo, zip_ref: zipfile.ZipFile) -> Optional[Dataset]:
+        """
+        Read a DICOM archive member.
+
+        Runs on the stream's load threads, so it must not touch the database.
+
+        Args:
+            info: Archive member
+            zip_ref: Open archive
+
+        Returns:
+            Dataset, or None if the member could not be read
+        """
+        try:
+            with self._open_member(zip_ref, info) as f:
+                ds = dcmread(f)
+            logger.debug(f"Loaded instance: {info.filename}")
+            return ds
+        except Exception as e:
+            logger.warning(f"Error reading {info.filename}: {e}")
+            return None
+
+    def _resolve_and_prepare(
+        self,
+        ds: Dataset,
+        transfer_syntax: Optional[str],
+        prepare_dataset_func: Optional[Callable[[Dataset, str], None]],
+        phi_cache: Optional[Dict] = None
+    ) -> Optional[Dataset]:
+        """
+        Restore a loaded dataset's PHI and prepare it for sending.
+
+        Args:
+            ds: Loaded dataset
+            transfer_syntax: Transfer syntax passed to prepare_dataset_func
+            prepare_dataset_func: Function to prepare the dataset, if any
+            phi_cache: Patient lookups shared by the archive's members
+
+        Returns:
+            Prepared dataset, or None if it could not be resolved
+        """
+        try:
+            ds = self.resolver.resolve_dataset(ds, cache=phi_cache)
+            if prepare_dataset_func is not None:
+                prepare_dataset_func(ds, transfer_syntax)
+            return ds
+        except Exception as e:
+            logger.warning(f"Error resolving instance {getattr(ds, 'SOPInstanceUID', 'unknown')}: {e}")
+            return None
 
     def _acquire_lock(self, node: str, operation: str, uid: str) -> bool:
         """
         Acquire a download lock to prevent concurrent downloads.
 
+        Does not block: identical requests to this service already share
+        one download, and a download holding the lock elsewhere produces
+        nothing this request could reuse, so the caller proceeds at once.
+
         Args:
             node: Node identifier
             operation: Operation type
@@ -380,9 +850,7 @@ class DICOMDownloadService:
         lock_acquired = self.lock_manager.acquire_lock(node, operation, uid)
 
         if not lock_acquired:
-            logger.warning(f"Download already in progress for {uid}, waiting...")
-            import time
-            time.sleep(0.5)
+            logger.warning(f"Download already in progress for {uid}, downloading anyway")
 
         return lock_acquired
 
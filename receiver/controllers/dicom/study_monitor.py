@@ -27,6 +27,8 @@ class StudyMonitor:
         self.timeout: int = timeout or getattr(settings, 'DICOM_STUDY_TIMEOUT', 60)
         self.study_last_activity: Dict[str, float] = {}
         self.study_monitor_lock: threading.Lock = threading.Lock()
+        # Wakes the monitor thread when the first study becomes active
+        self._activity_condition = threading.Condition(self.study_monitor_lock)
         self.active_studies: Set[str] = set()
         self.study_complete_callbacks: List[Callable[[str], None]] = []
 
@@ -55,31 +57,53 @@ class StudyMonitor:
         Args:
             study_uid: Study Instance UID
         """
-        now = time.time()
         with self.study_monitor_lock:
-            self.study_last_activity[study_uid] = now
+            # Later activity never brings the next deadline forward, so the
+            # monitor only needs waking when it is idle
+            if not self.study_last_activity:
+                self._activity_condition.notify()
+            # Re-inserted rather than updated, and timed under the lock, so
+            # the dict stays ordered by last activity
+            self.study_last_activity.pop(study_uid, None)
+            self.study_last_activity[study_uid] = time.monotonic()
             self.active_studies.add(study_uid)
             logger.debug(f"Updated activity for study: {study_uid}")
 
     def _monitor_studies_timeout(self) -> None:
-        """Monitor studies for timeout since last activity."""
+        """
+        Monitor studies for timeout since last activity.
+
+        Sleeps until the earliest study deadline instead of polling, and
+        indefinitely while no study is active. study_last_activity is
+        ordered by last activity, so only the studies that timed out and
+        the first one still active are looked at.
+        """
         logger.info("Study timeout monitor started")
 
         while True:
-            current_time = time.time()
             studies_to_finalize = []
 
             with self.study_monitor_lock:
-                for study_uid, last_activity in list(self.study_last_activity.items()):
-                    if current_time - last_activity > self.timeout:
-                        studies_to_finalize.append(study_uid)
-                        self.study_last_activity.pop(study_uid)
+                current_time = time.monotonic()
+                for study_uid, last_activity in self.study_last_activity.items():
+                    if current_time - last_activity <= self.timeout:
+                        break
+                    studies_to_finalize.append(study_uid)
+
+                for study_uid in studies_to_finalize:
+                    del self.study_last_activity[study_uid]
+
+                if not studies_to_finalize:
+                    if self.study_last_activity:
+                        next_deadline = next(iter(self.study_last_activity.values())) + self.timeout
+                        self._activity_condition.wait(max(next_deadline - current_time, 0) + 0.01)
+                    else:
+                        self._activity_condition.wait()
+                    continue
 
             for study_uid in studies_to_finalize:
                 self._finalize_study(study_uid)
 
-            time.sleep(1)
-
     def _finalize_study(self, study_uid: str) -> None:
         """
         Finalize a study after timeout.
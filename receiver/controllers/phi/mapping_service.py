@@ -6,7 +6,9 @@ Separates database logic from business logic.
 """
 import threading
 import logging
-from typing import Dict, Optional, List, Any
+from typing import Dict, Iterable, Optional, List, Any
+
+from django.db.models import Q
 
 from receiver.models import PatientMapping
 
@@ -56,6 +58,32 @@ class PatientMappingService:
 
         return None
 
+    def find_many_by_anonymous(
+        self,
+        anonymous_names: Iterable[str] = (),
+        anonymous_ids: Iterable[str] = ()
+    ) -> List[PatientMapping]:
+        """
+        Find the mappings matching any of several anonymous identifiers.
+
+        Args:
+            anonymous_names: Anonymous patient names
+            anonymous_ids: Anonymous patient IDs
+
+        Returns:
+            List of matching PatientMapping objects, in one query
+        """
+        anonymous_names = list(anonymous_names)
+        anonymous_ids = list(anonymous_ids)
+        if not anonymous_names and not anonymous_ids:
+            return []
+
+        with self._lock:
+            return list(PatientMapping.objects.filter(
+                Q(anonymous_patient_name__in=anonymous_names)
+                | Q(anonymous_patient_id__in=anonymous_ids)
+            ))
+
     def find_by_original(
         self,
         original_name: Optional[str] = None,
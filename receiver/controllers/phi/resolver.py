@@ -5,14 +5,20 @@ Thread-safe operations for concurrent queries.
 Uses local database (PatientMapping) for resolution.
 """
 import logging
-from typing import Dict, Optional, List, Any
+from typing import Dict, Iterable, Optional, List, Any, Tuple
 
 from pydicom import Dataset
+from pydicom.datadict import dictionary_VR, tag_for_keyword
+from pydicom.dataelem import DataElement
+from pydicom.tag import BaseTag, Tag
 
 from .mapping_service import PatientMappingService
 
 logger = logging.getLogger(__name__)
 
+# Identifiers restored from the mapping itself, never from PHI metadata
+_IDENTIFIER_KEYWORDS = frozenset({'PatientName', 'PatientID'})
+
 
 class PHIResolver:
     """
@@ -57,12 +63,7 @@ class PHIResolver:
         )
 
         if mapping:
-            return {
-                'original_name': mapping.original_patient_name,
-                'original_id': mapping.original_patient_id,
-                'anonymous_name': mapping.anonymous_patient_name,
-                'anonymous_id': mapping.anonymous_patient_id,
-            }
+            return self._mapping_info(mapping)
 
         # If not found and name contains ^, try removing trailing ^
         if anonymous_name and '^' in anonymous_name:
@@ -73,29 +74,96 @@ class PHIResolver:
             )
             if mapping:
                 logger.info(f"Resolved using cleaned name: {anonymous_name} -> {clean_name}")
-                return {
-                    'original_name': mapping.original_patient_name,
-                    'original_id': mapping.original_patient_id,
-                    'anonymous_name': mapping.anonymous_patient_name,
-                    'anonymous_id': mapping.anonymous_patient_id,
-                }
+                return self._mapping_info(mapping)
 
         return None
 
+    def resolve_patients_bulk(
+        self,
+        pairs: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], Optional[Dict[str, Any]]]:
+        """
+        Resolve several (anonymous name, anonymous ID) pairs at once.
+
+        Matches like resolve_patient(), including the trailing '^'
+        fallback, but all mappings are fetched in a single query. Each
+        result also carries the patient-level 'phi_metadata', so callers
+        need no second query for it.
+
+        Args:
+            pairs: (anonymous name, anonymous ID) pairs
+
+        Returns:
+            Dict of pair to original patient information, or None if not found
+        """
+        pairs = set(pairs)
+        names = set()
+        ids = set()
+        for anonymous_name, anonymous_id in pairs:
+            if anonymous_name:
+                names.add(anonymous_name)
+                if '^' in anonymous_name:
+                    names.add(anonymous_name.rstrip('^'))
+            elif anonymous_id:
+                ids.add(anonymous_id)
+
+        mappings = self.mapping_service.find_many_by_anonymous(
+            anonymous_names=names,
+            anonymous_ids=ids
+        )
+        by_name = {mapping.anonymous_patient_name: mapping for mapping in mappings}
+        by_id = {mapping.anonymous_patient_id: mapping for mapping in mappings}
+
+        resolved = {}
+        for anonymous_name, anonymous_id in pairs:
+            if anonymous_name:
+                mapping = by_name.get(anonymous_name)
+                if mapping is None and '^' in anonymous_name:
+                    mapping = by_name.get(anonymous_name.rstrip('^'))
+            else:
+                mapping = by_id.get(anonymous_id) if anonymous_id else None
+
+            if mapping is None:
+                resolved[(anonymous_name, anonymous_id)] = None
+                continue
+
+            info = self._mapping_info(mapping)
+            info['phi_metadata'] = mapping.get_phi_metadata()
+            resolved[(anonymous_name, anonymous_id)] = info
+
+        return resolved
+
+    @staticmethod
+    def _mapping_info(mapping) -> Dict[str, str]:
+        """Original and anonymous identifiers of a mapping."""
+        return {
+            'original_name': mapping.original_patient_name,
+            'original_id': mapping.original_patient_id,
+            'anonymous_name': mapping.anonymous_patient_name,
+            'anonymous_id': mapping.anonymous_patient_id,
+        }
+
     def resolve_dataset(
         self,
         dataset: Dataset,
         session=None,
-        scan=None
+        scan=None,
+        cache: Optional[Dict[Tuple[Optional[str], Optional[str]], Any]] = None
     ) -> Dataset:
         """
         De-anonymize patient data in a DICOM dataset.
         Restores all removed PHI data from three levels: patient, study, and series.
 
+        Patient lookups can be shared across datasets through ``cache``,
+        keyed by the anonymous name and ID. Callers resolving many instances
+        of the same study pass one dict for all of them, so the mapping is
+        queried once per patient instead of once per instance.
+
         Args:
             dataset: pydicom Dataset object with anonymous patient data
             session: Optional Session object to restore study-level PHI
             scan: Optional Scan object to restore series-level PHI
+            cache: Optional dict of patient lookups shared between calls
 
         Returns:
             Dataset with original patient information and PHI restored from all levels
@@ -106,26 +174,28 @@ class PHIResolver:
         if not anonymous_name and not anonymous_id:
             return dataset
 
-        # 1. Restore patient identifiers
-        mapping_info = self.resolve_patient(
-            anonymous_name=str(anonymous_name) if anonymous_name else None,
-            anonymous_id=str(anonymous_id) if anonymous_id else None
+        key = (
+            str(anonymous_name) if anonymous_name else None,
+            str(anonymous_id) if anonymous_id else None
         )
 
-        if mapping_info:
+        # 1. Look up patient identifiers and patient-level PHI
+        if cache is not None and key in cache:
+            patient = cache[key]
+        else:
+            patient = self._lookup_patient(*key)
+            if cache is not None:
+                cache[key] = patient
+
+        if patient:
+            mapping_info, patient_elements = patient
             dataset.PatientName = mapping_info['original_name']
             dataset.PatientID = mapping_info['original_id']
 
             # 2. Restore patient-level PHI from PatientMapping
-            mapping = self.mapping_service.find_by_anonymous(
-                anonymous_name=mapping_info['anonymous_name']
-            )
-
-            if mapping:
-                patient_phi = mapping.get_phi_metadata()
-                if patient_phi:
-                    logger.debug(f"Restoring patient-level PHI ({len(patient_phi)} fields)")
-                    self._restore_phi_metadata(dataset, patient_phi)
+            if patient_elements:
+                logger.debug(f"Restoring patient-level PHI ({len(patient_elements)} fields)")
+                self._apply_phi_elements(dataset, patient_elements)
 
             # 3. Restore study-level PHI from Session
             if session:
@@ -143,6 +213,39 @@ class PHIResolver:
 
         return dataset
 
+    def _lookup_patient(
+        self,
+        anonymous_name: Optional[str],
+        anonymous_id: Optional[str]
+    ) -> Optional[Tuple[Dict[str, str], List[Tuple[Optional[BaseTag], str, str, Any]]]]:
+        """
+        Look up original identifiers and patient-level PHI for a patient.
+
+        The PHI metadata is compiled to elements here, so cached lookups
+        apply it without resolving keywords again.
+
+        Args:
+            anonymous_name: Anonymous patient name
+            anonymous_id: Anonymous patient ID
+
+        Returns:
+            Tuple of (mapping info, compiled patient PHI), or None if not found
+        """
+        mapping_info = self.resolve_patient(
+            anonymous_name=anonymous_name,
+            anonymous_id=anonymous_id
+        )
+
+        if not mapping_info:
+            return None
+
+        mapping = self.mapping_service.find_by_anonymous(
+            anonymous_name=mapping_info['anonymous_name']
+        )
+        patient_phi = mapping.get_phi_metadata() if mapping else None
+
+        return mapping_info, self._compile_phi_metadata(patient_phi)
+
     def _restore_phi_metadata(self, dataset: Dataset, phi_metadata: Dict[str, str]) -> None:
         """
         Restore removed PHI metadata to dataset.
@@ -154,14 +257,63 @@ class PHIResolver:
         if not phi_metadata:
             return
 
-        for tag_name, value in phi_metadata.items():
+        self._apply_phi_elements(dataset, self._compile_phi_metadata(phi_metadata))
+
+    @staticmethod
+    def _compile_phi_metadata(
+        phi_metadata: Optional[Dict[str, Any]]
+    ) -> List[Tuple[Optional[BaseTag], str, str, Any]]:
+        """
+        Resolve PHI metadata keywords to tags and VRs once.
+
+        Args:
+            phi_metadata: Dict of tag names and values to restore
+
+        Returns:
+            List of (tag, VR, keyword, value); tag is None for unknown keywords
+        """
+        elements = []
+        for keyword, value in (phi_metadata or {}).items():
+            if keyword in _IDENTIFIER_KEYWORDS:
+                continue
+            tag = tag_for_keyword(keyword)
+            if tag is not None:
+                tag = Tag(tag)
+            vr = dictionary_VR(tag) if tag is not None else ''
+            elements.append((tag, vr, keyword, value))
+        return elements
+
+    @staticmethod
+    def _apply_phi_elements(
+        dataset: Dataset,
+        elements: List[Tuple[Optional[BaseTag], str, str, Any]]
+    ) -> None:
+        """
+        Write compiled PHI elements to a dataset by tag.
+
+        Matches setattr: existing elements keep their VR and get the new
+        value, missing ones are created with the dictionary VR and written
+        to the element dict directly, skipping the keyword and tag handling
+        of setattr. Sequences and unknown keywords go through setattr.
+
+        Args:
+            dataset: DICOM dataset
+            elements: Compiled elements from _compile_phi_metadata()
+        """
+        elements_by_tag = dataset._dict
+        for tag, vr, keyword, value in elements:
             try:
-                if tag_name in ['PatientName', 'PatientID']:
+                if tag is None or vr == 'SQ':
+                    setattr(dataset, keyword, value)
                     continue
 
-                setattr(dataset, tag_name, value)
+                if tag in elements_by_tag:
+                    # Item access converts raw elements read from file first
+                    dataset[tag].value = value
+                else:
+                    elements_by_tag[tag] = DataElement(tag, vr, value)
             except Exception as e:
-                logger.warning(f"Could not restore tag {tag_name}: {e}")
+                logger.warning(f"Could not restore tag {keyword}: {e}")
 
     def get_all_mappings(self) -> List[Dict[str, Any]]:
         """
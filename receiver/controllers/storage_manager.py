@@ -14,6 +14,10 @@ from .storage import FileManager, StudyService, ArchiveService
 logger = logging.getLogger(__name__)
 
 
+class StorageWriteError(OSError):
+    """Raised when a received DICOM file could not be written to storage."""
+
+
 class StorageManager:
     """
     Facade for DICOM file storage and study management.
@@ -80,6 +84,9 @@ class StorageManager:
 
         Returns:
             Dict containing study and series objects
+
+        Raises:
+            StorageWriteError: If the DICOM file could not be written
         """
         study_uid = dataset.StudyInstanceUID
         series_uid = dataset.SeriesInstanceUID
@@ -113,7 +120,8 @@ class StorageManager:
         success = self.file_manager.save_dicom_file(dataset, file_path)
 
         if not success:
-            logger.error(f"Failed to save DICOM file: {file_path}")
+            # Not recorded as an instance, so the sender is told to retry
+            raise StorageWriteError(f"Failed to save DICOM file: {file_path}")
 
         file_size = self.file_manager.get_file_size(file_path) or 0
 
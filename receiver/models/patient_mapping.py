@@ -65,10 +65,11 @@ class PatientMapping(models.Model):
             anonymous_patient_id = self.anonymous_patient_id
 
             sessions = Session.objects.filter(patient_id=anonymous_patient_id)
-            session_count = sessions.count()
 
+            session_count = 0
             for session in sessions:
                 session.delete(skip_patient_cleanup=True)
+                session_count += 1
 
             logger.info(
                 f"Patient mapping deleted: {self.original_patient_name} ({self.original_patient_id}) -> "
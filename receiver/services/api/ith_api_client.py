@@ -4,7 +4,8 @@ Handles all communication with the ITH backend API.
 """
 import requests
 import logging
-from typing import Dict, Any, Optional, List
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Optional, List, BinaryIO, Union
 from pathlib import Path
 
 logger = logging.getLogger('receiver.ith_client')
@@ -15,6 +16,11 @@ class IthAPIClient:
     Client for ITH REST API.
     """
 
+    # Keep-alive connections kept per host. The client is shared by every
+    # association, query handler and config refresh, which together exceed
+    # the requests default of 10 and would otherwise drop connections.
+    POOL_MAXSIZE = 32
+
     def __init__(self, base_url: str, proxy_key: str, workspace_id: Optional[str] = None):
         """
         Initialize API client.
@@ -38,6 +44,10 @@ class IthAPIClient:
         self.session = requests.Session()
         self.session.headers.update(self.headers)
 
+        adapter = HTTPAdapter(pool_maxsize=self.POOL_MAXSIZE)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
     def set_workspace_id(self, workspace_id: str):
         """Set workspace ID (typically obtained from WebSocket connection)."""
         self.workspace_id = workspace_id
@@ -94,6 +104,46 @@ class IthAPIClient:
             logger.error(f"Request failed: {e}")
             raise
 
+    def _write_response(
+        self,
+        response: requests.Response,
+        output: Union[Path, BinaryIO],
+        progress_callback: Optional[callable] = None
+    ) -> Union[Path, BinaryIO]:
+        """
+        Write a streamed response body to a path or a writable file object.
+
+        Args:
+            response: Streaming HTTP response
+            output: Path to save to, or a binary file object to write into
+            progress_callback: Optional callback(bytes_downloaded, total_bytes)
+
+        Returns:
+            Path or file object that was written
+        """
+        total_size = int(response.headers.get('content-length', 0))
+        bytes_downloaded = 0
+
+        if hasattr(output, 'write'):
+            f = output
+        else:
+            output = Path(output)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            f = open(output, 'wb')
+
+        try:
+            for chunk in response.iter_content(chunk_size=8192):
+                f.write(chunk)
+                bytes_downloaded += len(chunk)
+
+                if progress_callback:
+                    progress_callback(bytes_downloaded, total_size)
+        finally:
+            if f is not output:
+                f.close()
+
+        return output
+
     # ==================== Proxy Configuration ====================
 
     def get_proxy_configuration(self) -> Optional[Dict[str, Any]]:
@@ -164,7 +214,7 @@ class IthAPIClient:
     def download_subject(
         self,
         subject_id: str,
-        output_path: Path,
+        output_path: Union[Path, BinaryIO],
         compression_format: str = 'zip',
         compression_level: int = 6,
         progress_callback: Optional[callable] = None
@@ -174,13 +224,13 @@ class IthAPIClient:
 
         Args:
             subject_id: Subject identifier
-            output_path: Path to save archive
+            output_path: Path to save archive, or a writable binary file object
             compression_format: zip or tar.gz
             compression_level: 0-9
             progress_callback: Optional callback(bytes_downloaded, total_bytes)
 
         Returns:
-            Path: Path to downloaded file
+            Path to downloaded file, or the file object written to
         """
         endpoint = f"/api/v1/proxy/{self.workspace_id}/subjects/{subject_id}/download"
         params = {
@@ -189,20 +239,7 @@ class IthAPIClient:
         }
 
         response = self._request("GET", endpoint, params=params, stream=True)
-
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        total_size = int(response.headers.get('content-length', 0))
-        bytes_downloaded = 0
-
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-                bytes_downloaded += len(chunk)
-
-                if progress_callback:
-                    progress_callback(bytes_downloaded, total_size)
+        output_path = self._write_response(response, output_path, progress_callback)
 
         logger.info(f"Downloaded subject {subject_id} to {output_path}")
         return output_path
@@ -223,6 +260,26 @@ class IthAPIClient:
         response = self._request("GET", endpoint, params=filters)
         return response.json()
 
+    def find_sessions_by_study_uid(self, study_uid: str) -> List[Dict[str, Any]]:
+        """
+        Find the sessions holding a study.
+
+        The StudyInstanceUID is sent as a filter so the backend can return
+        only matching sessions. Results are matched again locally, so the
+        answer is correct even if the filter is not applied server side.
+
+        Args:
+            study_uid: Study Instance UID
+
+        Returns:
+            List of session dicts with that StudyInstanceUID
+        """
+        response = self.list_sessions(study_instance_uid=study_uid)
+        return [
+            session for session in response.get('sessions', [])
+            if session.get('study_instance_uid') == study_uid
+        ]
+
     def get_session(self, session_id: str, include_deleted: bool = False) -> Dict[str, Any]:
         """
         Get specific session by ID.
@@ -243,7 +300,7 @@ class IthAPIClient:
         self,
         session_id: str,
         subject_id: str,
-        output_path: Path,
+        output_path: Union[Path, BinaryIO],
         compression_format: str = 'zip',
         compression_level: int = 6,
         progress_callback: Optional[callable] = None
@@ -254,13 +311,13 @@ class IthAPIClient:
         Args:
             session_id: Session identifier
             subject_id: Parent subject ID
-            output_path: Path to save archive
+            output_path: Path to save archive, or a writable binary file object
             compression_format: zip or tar.gz
             compression_level: 0-9
             progress_callback: Optional callback(bytes_downloaded, total_bytes)
 
         Returns:
-            Path: Path to downloaded file
+            Path to downloaded file, or the file object written to
         """
         endpoint = f"/api/v1/proxy/{self.workspace_id}/sessions/{session_id}/download"
         params = {
@@ -270,20 +327,7 @@ class IthAPIClient:
         }
 
         response = self._request("GET", endpoint, params=params, stream=True)
-
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        total_size = int(response.headers.get('content-length', 0))
-        bytes_downloaded = 0
-
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-                bytes_downloaded += len(chunk)
-
-                if progress_callback:
-                    progress_callback(bytes_downloaded, total_size)
+        output_path = self._write_response(response, output_path, progress_callback)
 
         logger.info(f"Downloaded session {session_id} to {output_path}")
         return output_path
@@ -332,7 +376,7 @@ class IthAPIClient:
         scan_id: str,
         subject_id: str,
         session_id: str,
-        output_path: Path,
+        output_path: Union[Path, BinaryIO],
         compression_format: str = 'zip',
         compression_level: int = 6,
         progress_callback: Optional[callable] = None
@@ -344,13 +388,13 @@ class IthAPIClient:
             scan_id: Scan identifier
             subject_id: Parent subject ID
             session_id: Parent session ID
-            output_path: Path to save archive
+            output_path: Path to save archive, or a writable binary file object
             compression_format: zip or tar.gz
             compression_level: 0-9
             progress_callback: Optional callback(bytes_downloaded, total_bytes)
 
         Returns:
-            Path: Path to downloaded file
+            Path to downloaded file, or the file object written to
         """
         endpoint = f"/api/v1/proxy/{self.workspace_id}/scans/{scan_id}/download"
         params = {
@@ -361,20 +405,7 @@ class IthAPIClient:
         }
 
         response = self._request("GET", endpoint, params=params, stream=True)
-
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        total_size = int(response.headers.get('content-length', 0))
-        bytes_downloaded = 0
-
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-                bytes_downloaded += len(chunk)
-
-                if progress_callback:
-                    progress_callback(bytes_downloaded, total_size)
+        output_path = self._write_response(response, output_path, progress_callback)
 
         logger.info(f"Downloaded scan {scan_id} to {output_path}")
         return output_path
@@ -120,15 +120,7 @@ class AccessControlService:
         if not ae_title:
             return None
 
-        normalized_ae = ae_title.strip().upper()
-
-        nodes = self.config_service.load_nodes()
-        matched_nodes = []
-
-        for node in nodes:
-            node_ae_normalized = node.ae_title.strip().upper() if node.ae_title else ""
-            if node_ae_normalized == normalized_ae:
-                matched_nodes.append(node)
+        matched_nodes = self.config_service.get_nodes_by_ae_title(ae_title)
 
         if not matched_nodes:
             return None
@@ -36,6 +36,7 @@ class ProxyConfigService:
         self.api_client = api_client
 
         self._nodes: List[NodeConfig] = []
+        self._nodes_by_ae_title: Dict[str, List[NodeConfig]] = {}
         self._proxy_config: Optional[Dict[str, Any]] = None
         self._full_config: Optional[Dict[str, Any]] = None
 
@@ -116,7 +117,7 @@ class ProxyConfigService:
 
     def _parse_and_store_nodes(self, nodes_data: List[Dict[str, Any]]) -> None:
         """Parse nodes from API response and store in memory."""
-        self._nodes = []
+        nodes: List[NodeConfig] = []
 
         for node in nodes_data:
             if 'ip' in node and 'ip_address' not in node:
@@ -166,10 +167,32 @@ class ProxyConfigService:
                 is_reachable=node.get('is_reachable', False),
                 metadata=node.get('metadata', {})
             )
-            self._nodes.append(node_config)
+            nodes.append(node_config)
+
+        # Index by normalized AE title; rebuilt with every configuration
+        nodes_by_ae_title: Dict[str, List[NodeConfig]] = {}
+        for node_config in nodes:
+            key = self.normalize_ae_title(node_config.ae_title)
+            nodes_by_ae_title.setdefault(key, []).append(node_config)
+
+        self._nodes = nodes
+        self._nodes_by_ae_title = nodes_by_ae_title
 
         logger.info(f"Parsed {len(self._nodes)} nodes from API")
 
+    @staticmethod
+    def normalize_ae_title(ae_title: str) -> str:
+        """
+        Normalize an AE title for case-insensitive comparison.
+
+        Args:
+            ae_title: AE title
+
+        Returns:
+            Stripped, upper-cased AE title
+        """
+        return ae_title.strip().upper() if ae_title else ""
+
     def load_nodes(self) -> List[NodeConfig]:
         """
         Load nodes from in-memory storage.
@@ -213,6 +236,19 @@ class ProxyConfigService:
                 return node
         return None
 
+    def get_nodes_by_ae_title(self, ae_title: str) -> List[NodeConfig]:
+        """
+        Get nodes by AE title.
+        Case-insensitive comparison with whitespace trimming.
+
+        Args:
+            ae_title: AE title
+
+        Returns:
+            List of matching NodeConfig objects, in configuration order
+        """
+        return list(self._nodes_by_ae_title.get(self.normalize_ae_title(ae_title), ()))
+
     def get_nodes_by_ids(self, node_ids: List[str]) -> List[NodeConfig]:
         """
         Get multiple nodes by their IDs.
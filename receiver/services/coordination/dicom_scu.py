@@ -2,14 +2,17 @@
 DICOM SCU (Service Class User) - Client for sending DICOM files to PACS.
 """
 import logging
+import os
 import time
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from pynetdicom import AE, StoragePresentationContexts
 from pynetdicom.sop_class import Verification
 from pydicom import dcmread
 from pydicom.errors import InvalidDicomError
 
+from receiver.utils.storage import find_dicom_files
+
 logger = logging.getLogger('receiver.dicom_scu')
 
 
@@ -141,7 +144,7 @@ class DICOMServiceUser:
 
     def send_files(
         self,
-        files: List[Path],
+        files: List[Union[str, Path]],
         host: str,
         port: int,
         called_ae_title: str,
@@ -201,18 +204,19 @@ class DICOMServiceUser:
                         )
 
                 for file_path in files:
+                    file_name = os.path.basename(file_path)
                     try:
-                        dataset = dcmread(str(file_path))
+                        dataset = dcmread(file_path)
 
                         status = assoc.send_c_store(dataset)
 
                         if status and status.Status == 0x0000:
                             files_sent += 1
-                            logger.debug(f" Sent: {file_path.name}")
+                            logger.debug(f" Sent: {file_name}")
                         else:
                             files_failed += 1
-                            logger.error(f" Failed to send {file_path.name}: Status {status.Status if status else 'None'}")
-                            last_error = f"C-STORE failed for {file_path.name}"
+                            logger.error(f" Failed to send {file_name}: Status {status.Status if status else 'None'}")
+                            last_error = f"C-STORE failed for {file_name}"
 
                     except InvalidDicomError as e:
                         files_failed += 1
@@ -290,10 +294,7 @@ class DICOMServiceUser:
             logger.error(error_msg)
             return DICOMSendResult(success=False, error=error_msg)
 
-        if recursive:
-            dicom_files = list(directory.rglob('*.dcm'))
-        else:
-            dicom_files = list(directory.glob('*.dcm'))
+        dicom_files = find_dicom_files(directory, recursive=recursive)
 
         if not dicom_files:
             logger.warning(f"No DICOM files found in {directory}")
@@ -3,7 +3,8 @@ API Query Service
 Fetches DICOM metadata from ITH API for C-FIND queries when local data is not available.
 """
 import logging
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Set
 from receiver.services.api import IthAPIClient
 from receiver.controllers.phi import PHIResolver
 
@@ -16,6 +17,9 @@ class APIQueryService:
     Used as fallback when local storage doesn't have the data (e.g., after cleanup).
     """
 
+    # Concurrent subject/scan requests per study listing
+    API_FETCH_WORKERS = 8
+
     def __init__(self, api_client: IthAPIClient, resolver: PHIResolver):
         """
         Initialize API query service.
@@ -84,15 +88,50 @@ class APIQueryService:
         """
         Query all studies (sessions) from API.
 
+        Returns:
+            List of study dictionaries with de-anonymized info
+        """
+        return self.query_studies()
+
+    def query_studies(
+        self,
+        study_instance_uid: Optional[str] = None,
+        accession_number: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Query studies (sessions) from API, optionally filtered.
+
+        Filters are sent to the backend and matched again on the returned
+        sessions, so the result is correct even if the backend ignores
+        them. Sessions dropped here skip their subject and scan requests.
+        Patient filters are not accepted: the API only holds anonymized
+        identifiers, so those are matched by the caller after resolution.
+
+        Args:
+            study_instance_uid: Only return the study with this UID
+            accession_number: Only return studies with this accession number
+
         Returns:
             List of study dictionaries with de-anonymized info
         """
         try:
             logger.info("Querying studies from ITH API...")
 
-            response = self.api_client.list_sessions()
+            filters = {}
+            if study_instance_uid:
+                filters['study_instance_uid'] = study_instance_uid
+            if accession_number:
+                filters['accession_number'] = accession_number
+
+            response = self.api_client.list_sessions(**filters)
             sessions = response.get('sessions', [])
 
+            if filters:
+                sessions = [
+                    session for session in sessions
+                    if all((session.get(key) or '') == value for key, value in filters.items())
+                ]
+
             logger.debug(f"Found {len(sessions)} sessions from API")
             logger.debug(f"Raw API response: {response}")
 
@@ -106,156 +145,184 @@ class APIQueryService:
                     for j, scan in enumerate(session.get('scans', []), 1):
                         logger.debug(f"Scan #{j}: {scan}")
 
-            studies = []
-            for idx, session in enumerate(sessions, 1):
-                workspace_id = session.get('workspace_id', '')
-                subject_id = session.get('subject_id', '')
-                session_id = session.get('session_id', '')
-
-                logger.info(f"\n{'='*60}")
-                logger.info(f"Processing Session #{idx}: {session_id}")
-                logger.info(f"{'='*60}")
-
-                try:
-                    logger.info(f" Fetching subject details for subject_id: {subject_id}")
-                    subject_response = self.api_client.get_subject(subject_id)
-
-                    logger.info(f" Subject API Response:")
-
-                    subject_data = subject_response.get('subject', {})
-                    demographics = subject_data.get('demographics', {})
-
-                    anonymous_name = subject_data.get('label', '')
-                    anonymous_id = anonymous_name if anonymous_name else subject_data.get('subject_identifier', subject_id)
-                    patient_birth_date = demographics.get('dob', '')
-
-                    logger.info(f"   Extracted from subject:")
-                    logger.info(f"     - Anonymous ID: {anonymous_id}")
-                    logger.info(f"     - Anonymous Name: {anonymous_name}")
-                    logger.info(f"     - Birth Date: {patient_birth_date}")
-                    logger.info(f"     - Demographics: {demographics}")
-
-                    gender = demographics.get('gender')
-                    if gender:
-                        gender_lower = str(gender).lower()
-                        if gender_lower == 'male':
-                            patient_sex = 'M'
-                        elif gender_lower == 'female':
-                            patient_sex = 'F'
+            # Sessions of the same patient share one mapping lookup
+            originals_by_patient: Dict[tuple, Optional[Dict[str, str]]] = {}
+
+            # Subject and scan lookups do not depend on each other, so they
+            # are all issued up front and complete while earlier sessions
+            # are processed. Each subject is fetched once.
+            with ThreadPoolExecutor(
+                max_workers=self.API_FETCH_WORKERS,
+                thread_name_prefix='study-query'
+            ) as executor:
+                subject_futures = {
+                    subject_id: executor.submit(self.api_client.get_subject, subject_id)
+                    for subject_id in {session.get('subject_id', '') for session in sessions}
+                }
+                scan_futures = [
+                    executor.submit(
+                        self.api_client.list_scans,
+                        session.get('subject_id', ''),
+                        session.get('session_id', '')
+                    )
+                    for session in sessions
+                ]
+
+                studies = []
+                for idx, session in enumerate(sessions, 1):
+                    workspace_id = session.get('workspace_id', '')
+                    subject_id = session.get('subject_id', '')
+                    session_id = session.get('session_id', '')
+
+                    logger.info(f"\n{'='*60}")
+                    logger.info(f"Processing Session #{idx}: {session_id}")
+                    logger.info(f"{'='*60}")
+
+                    try:
+                        logger.info(f" Fetching subject details for subject_id: {subject_id}")
+                        subject_response = subject_futures[subject_id].result()
+
+                        logger.info(f" Subject API Response:")
+
+                        subject_data = subject_response.get('subject', {})
+                        demographics = subject_data.get('demographics', {})
+
+                        anonymous_name = subject_data.get('label', '')
+                        anonymous_id = anonymous_name if anonymous_name else subject_data.get('subject_identifier', subject_id)
+                        patient_birth_date = demographics.get('dob', '')
+
+                        logger.info(f"   Extracted from subject:")
+                        logger.info(f"     - Anonymous ID: {anonymous_id}")
+                        logger.info(f"     - Anonymous Name: {anonymous_name}")
+                        logger.info(f"     - Birth Date: {patient_birth_date}")
+                        logger.info(f"     - Demographics: {demographics}")
+
+                        gender = demographics.get('gender')
+                        if gender:
+                            gender_lower = str(gender).lower()
+                            if gender_lower == 'male':
+                                patient_sex = 'M'
+                            elif gender_lower == 'female':
+                                patient_sex = 'F'
+                            else:
+                                patient_sex = 'O'
                         else:
-                            patient_sex = 'O'
-                    else:
-                        patient_sex = ''
-
-                    logger.info(f"     - Gender: {gender} -> DICOM: {patient_sex}")
-
-                except Exception as e:
-                    logger.error(f" Could not fetch subject {subject_id}: {e}", exc_info=True)
-                    anonymous_id = subject_id
-                    anonymous_name = ''
-                    patient_birth_date = ''
-                    patient_sex = ''
-
-                logger.info(f"\n De-anonymizing patient data...")
-                original = self.resolver.resolve_patient(
-                    anonymous_name=anonymous_name,
-                    anonymous_id=anonymous_id
-                )
-
-                if original:
-                    patient_id = original['original_id']
-                    patient_name = original['original_name']
-                    logger.info(f" De-anonymized successfully:")
-                    logger.info(f"   {anonymous_name} ({anonymous_id}) -> {patient_name} ({patient_id})")
-                else:
-                    patient_id = anonymous_id
-                    patient_name = anonymous_name
-                    logger.warning(f"  No mapping found, using as-is: {anonymous_name} (ID: {anonymous_id})")
-
-                scans = []
-                try:
-                    logger.info(f"\n Fetching scans for session {session_id}...")
-                    scans_response = self.api_client.list_scans(subject_id, session_id)
+                            patient_sex = ''
 
-                    logger.info(f" Scans API Response:")
+                        logger.info(f"     - Gender: {gender} -> DICOM: {patient_sex}")
 
-                    scans = scans_response.get('scans', [])
-                    logger.info(f"   Found {len(scans)} scans")
+                    except Exception as e:
+                        logger.error(f" Could not fetch subject {subject_id}: {e}", exc_info=True)
+                        anonymous_id = subject_id
+                        anonymous_name = ''
+                        patient_birth_date = ''
+                        patient_sex = ''
 
-                    for scan_idx, scan in enumerate(scans, 1):
-                        logger.info(f"   Scan #{scan_idx}:")
-                        logger.info(f"     - ID: {scan.get('id')}")
-                        logger.info(f"     - Type: {scan.get('type')}")
-                        logger.info(f"     - Series UID: {scan.get('series_instance_uid', 'MISSING')}")
-                        logger.info(f"     - Instance count: {scan.get('instance_count', 0)}")
+                    logger.info(f"\n De-anonymizing patient data...")
+                    patient_key = (anonymous_name, anonymous_id)
+                    if patient_key in originals_by_patient:
+                        original = originals_by_patient[patient_key]
+                    else:
+                        original = self.resolver.resolve_patient(
+                            anonymous_name=anonymous_name,
+                            anonymous_id=anonymous_id
+                        )
+                        originals_by_patient[patient_key] = original
+
+                    if original:
+                        patient_id = original['original_id']
+                        patient_name = original['original_name']
+                        logger.info(f" De-anonymized successfully:")
+                        logger.info(f"   {anonymous_name} ({anonymous_id}) -> {patient_name} ({patient_id})")
+                    else:
+                        patient_id = anonymous_id
+                        patient_name = anonymous_name
+                        logger.warning(f"  No mapping found, using as-is: {anonymous_name} (ID: {anonymous_id})")
 
-                except Exception as e:
-                    logger.error(f" Could not fetch scans for session {session_id}: {e}", exc_info=True)
                     scans = []
+                    try:
+                        logger.info(f"\n Fetching scans for session {session_id}...")
+                        scans_response = scan_futures[idx - 1].result()
+
+                        logger.info(f" Scans API Response:")
+
+                        scans = scans_response.get('scans', [])
+                        logger.info(f"   Found {len(scans)} scans")
+
+                        for scan_idx, scan in enumerate(scans, 1):
+                            logger.info(f"   Scan #{scan_idx}:")
+                            logger.info(f"     - ID: {scan.get('id')}")
+                            logger.info(f"     - Type: {scan.get('type')}")
+                            logger.info(f"     - Series UID: {scan.get('series_instance_uid', 'MISSING')}")
+                            logger.info(f"     - Instance count: {scan.get('instance_count', 0)}")
+
+                    except Exception as e:
+                        logger.error(f" Could not fetch scans for session {session_id}: {e}", exc_info=True)
+                        scans = []
+
+                    logger.info(f"\n📄 Session Data:")
+                    logger.info(f"   Raw session object: {session}")
+
+                    study_date = session.get('date', '')
+                    study_time = session.get('time', '')
+
+                    logger.info(f"\n Extracting dates/times:")
+                    logger.info(f"   Session date: {session.get('date')}")
+                    logger.info(f"   Session time: {session.get('time')}")
+
+                    if study_date:
+                        study_date = study_date.replace('-', '')
+
+                    if study_time:
+                        study_time = study_time.replace(':', '')
+
+                    if patient_birth_date:
+                        patient_birth_date = patient_birth_date.replace('-', '')
+
+                    logger.info(f"   DICOM StudyDate: {study_date}")
+                    logger.info(f"   DICOM StudyTime: {study_time}")
+                    logger.info(f"   DICOM PatientBirthDate: {patient_birth_date}")
+
+                    logger.info(f"\n  Building study info:")
+
+                    study_description = session.get('description') or session.get('label', '')
+
+                    institution_name = session.get('institution_name')
+                    if not institution_name:
+                        scanner = session.get('scanner', {})
+                        institution_name = scanner.get('identifier', '') if scanner else ''
+
+                    study_info = {
+                        'PatientID': patient_id,
+                        'PatientName': patient_name,
+                        'PatientBirthDate': patient_birth_date,
+                        'PatientSex': patient_sex,
+                        'StudyInstanceUID': session.get('study_instance_uid', ''),
+                        'StudyID': session.get('session_id', ''),
+                        'StudyDescription': study_description,
+                        'StudyDate': study_date,
+                        'StudyTime': study_time,
+                        'AccessionNumber': session.get('accession_number', '') or '',
+                        'InstitutionName': institution_name or '',
+                        'ModalitiesInStudy': session.get('modality', ''),
+                        'ReferringPhysicianName': '',
+                        'PerformingPhysicianName': session.get('operator', '') or '',
+                    }
 
-                logger.info(f"\n📄 Session Data:")
-                logger.info(f"   Raw session object: {session}")
-
-                study_date = session.get('date', '')
-                study_time = session.get('time', '')
-
-                logger.info(f"\n Extracting dates/times:")
-                logger.info(f"   Session date: {session.get('date')}")
-                logger.info(f"   Session time: {session.get('time')}")
-
-                if study_date:
-                    study_date = study_date.replace('-', '')
-
-                if study_time:
-                    study_time = study_time.replace(':', '')
-
-                if patient_birth_date:
-                    patient_birth_date = patient_birth_date.replace('-', '')
-
-                logger.info(f"   DICOM StudyDate: {study_date}")
-                logger.info(f"   DICOM StudyTime: {study_time}")
-                logger.info(f"   DICOM PatientBirthDate: {patient_birth_date}")
-
-                logger.info(f"\n  Building study info:")
-
-                study_description = session.get('description') or session.get('label', '')
-
-                institution_name = session.get('institution_name')
-                if not institution_name:
-                    scanner = session.get('scanner', {})
-                    institution_name = scanner.get('identifier', '') if scanner else ''
-
-                study_info = {
-                    'PatientID': patient_id,
-                    'PatientName': patient_name,
-                    'PatientBirthDate': patient_birth_date,
-                    'PatientSex': patient_sex,
-                    'StudyInstanceUID': session.get('study_instance_uid', ''),
-                    'StudyID': session.get('session_id', ''),
-                    'StudyDescription': study_description,
-                    'StudyDate': study_date,
-                    'StudyTime': study_time,
-                    'AccessionNumber': session.get('accession_number', '') or '',
-                    'InstitutionName': institution_name or '',
-                    'ModalitiesInStudy': session.get('modality', ''),
-                    'ReferringPhysicianName': '',
-                    'PerformingPhysicianName': session.get('operator', '') or '',
-                }
-
-                study_info['NumberOfStudyRelatedSeries'] = len(scans)
-                study_info['NumberOfStudyRelatedInstances'] = sum(
-                    scan.get('instance_count', 0) for scan in scans
-                )
+                    study_info['NumberOfStudyRelatedSeries'] = len(scans)
+                    study_info['NumberOfStudyRelatedInstances'] = sum(
+                        scan.get('instance_count', 0) for scan in scans
+                    )
 
-                logger.info(f"   PatientID: {study_info['PatientID']}")
-                logger.info(f"   PatientName: {study_info['PatientName']}")
-                logger.info(f"   StudyInstanceUID: {study_info['StudyInstanceUID']}")
-                logger.info(f"   StudyDescription: {study_info['StudyDescription']}")
-                logger.info(f"   NumberOfStudyRelatedSeries: {study_info['NumberOfStudyRelatedSeries']}")
-                logger.info(f"   NumberOfStudyRelatedInstances: {study_info['NumberOfStudyRelatedInstances']}")
+                    logger.info(f"   PatientID: {study_info['PatientID']}")
+                    logger.info(f"   PatientName: {study_info['PatientName']}")
+                    logger.info(f"   StudyInstanceUID: {study_info['StudyInstanceUID']}")
+                    logger.info(f"   StudyDescription: {study_info['StudyDescription']}")
+                    logger.info(f"   NumberOfStudyRelatedSeries: {study_info['NumberOfStudyRelatedSeries']}")
+                    logger.info(f"   NumberOfStudyRelatedInstances: {study_info['NumberOfStudyRelatedInstances']}")
 
-                studies.append(study_info)
-                logger.info(f"\n Study added to results list")
+                    studies.append(study_info)
+                    logger.info(f"\n Study added to results list")
 
             logger.info(f"Retrieved {len(studies)} studies from API")
 
@@ -302,14 +369,8 @@ class APIQueryService:
         try:
             logger.info(f"Querying series for study {study_instance_uid} from API...")
 
-            response = self.api_client.list_sessions()
-            sessions = response.get('sessions', [])
-
-            matching_session = None
-            for session in sessions:
-                if session.get('study_instance_uid') == study_instance_uid:
-                    matching_session = session
-                    break
+            sessions = self.api_client.find_sessions_by_study_uid(study_instance_uid)
+            matching_session = sessions[0] if sessions else None
 
             if not matching_session:
                 logger.warning(f"No session found for study {study_instance_uid}")
@@ -380,7 +441,8 @@ class APIQueryService:
     def query_images_for_series(
         self,
         study_instance_uid: str,
-        series_instance_uid: str
+        series_instance_uid: str,
+        sop_instance_uids: Optional[Set[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Query images for a specific series from API.
@@ -388,6 +450,7 @@ class APIQueryService:
         Args:
             study_instance_uid: Study Instance UID
             series_instance_uid: Series Instance UID
+            sop_instance_uids: Only return these instances, if given
 
         Returns:
             List of image dictionaries
@@ -395,7 +458,8 @@ class APIQueryService:
         try:
             logger.info(f"Querying images for series {series_instance_uid} from API...")
 
-            response = self.api_client.list_sessions()
+            # Filtered server side when supported; still matched below
+            response = self.api_client.list_sessions(study_instance_uid=study_instance_uid)
             sessions = response.get('sessions', [])
 
             matching_session = None
@@ -448,6 +512,9 @@ class APIQueryService:
             for instance in instances:
                 instance_metadata = instance.get('metadata', {})
 
+                if sop_instance_uids and instance_metadata.get('sop_instance_uid') not in sop_instance_uids:
+                    continue
+
                 image_info = {
                     'PatientID': patient_id,
                     'PatientName': patient_name,
@@ -460,6 +527,11 @@ class APIQueryService:
 
                 images.append(image_info)
 
+                # SOP Instance UIDs are unique, so matching the only requested
+                # UID ends the scan
+                if sop_instance_uids and len(sop_instance_uids) == 1:
+                    break
+
             return images
 
         except Exception as e:
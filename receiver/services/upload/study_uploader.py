@@ -4,11 +4,14 @@ Uploads DICOM study archives to ITH API.
 Supports chunked uploads for files larger than 2GB.
 """
 import logging
+import os
 import zipfile
 from pathlib import Path
 from typing import Optional, Dict, Any, Tuple, List, TYPE_CHECKING
 import requests
 
+from receiver.utils.storage import find_dicom_files
+
 if TYPE_CHECKING:
     from receiver.services.api import IthAPIClient
 
@@ -340,6 +343,7 @@ class StudyUploader:
                     chunk_idx,
                     len(chunks),
                     chunk_scans,
+                    scans,
                     extract_dir,
                     study_info,
                     temp_dir
@@ -373,7 +377,7 @@ class StudyUploader:
                 except Exception as e:
                     logger.warning(f"Could not cleanup temp directory: {e}")
 
-    def _group_files_by_series(self, extract_dir: Path) -> Dict[str, List[Path]]:
+    def _group_files_by_series(self, extract_dir: Path) -> Dict[str, List[str]]:
         """
         Group DICOM files by SeriesInstanceUID.
 
@@ -387,13 +391,14 @@ class StudyUploader:
         from pydicom.errors import InvalidDicomError
 
         scans = {}
-        dcm_files = list(extract_dir.rglob('*.dcm'))
+        dcm_files = find_dicom_files(extract_dir)
 
         logger.info(f"Analyzing {len(dcm_files)} DICOM files...")
 
         for dcm_file in dcm_files:
             try:
-                ds = dcmread(str(dcm_file), stop_before_pixels=True)
+                # Only SeriesInstanceUID is parsed; other values are skipped
+                ds = dcmread(dcm_file, stop_before_pixels=True, specific_tags=[0x0020000E])
                 series_uid = getattr(ds, 'SeriesInstanceUID', 'UNKNOWN')
 
                 if series_uid not in scans:
@@ -401,13 +406,13 @@ class StudyUploader:
                 scans[series_uid].append(dcm_file)
 
             except (InvalidDicomError, Exception) as e:
-                logger.warning(f"Could not read {dcm_file.name}: {e}")
+                logger.warning(f"Could not read {os.path.basename(dcm_file)}: {e}")
 
         return scans
 
     def _create_scan_chunks(
         self,
-        scans: Dict[str, List[Path]],
+        scans: Dict[str, List[str]],
         extract_dir: Path
     ) -> List[List[str]]:
         """
@@ -423,7 +428,7 @@ class StudyUploader:
         """
         scan_sizes = {}
         for series_uid, files in scans.items():
-            total_size = sum(f.stat().st_size for f in files)
+            total_size = sum(os.path.getsize(f) for f in files)
             scan_sizes[series_uid] = total_size
 
         sorted_scans = sorted(scan_sizes.items(), key=lambda x: x[1], reverse=True)
@@ -464,6 +469,7 @@ class StudyUploader:
         chunk_idx: int,
         total_chunks: int,
         series_uids: List[str],
+        scans: Dict[str, List[str]],
         extract_dir: Path,
         study_info: Dict[str, Any],
         temp_dir: Path
@@ -475,6 +481,7 @@ class StudyUploader:
             chunk_idx: Current chunk index
             total_chunks: Total number of chunks
             series_uids: List of SeriesInstanceUIDs to include in this chunk
+            scans: Dict mapping SeriesInstanceUID to file paths
             extract_dir: Directory with extracted DICOM files
             study_info: Original study metadata
             temp_dir: Temporary directory for chunk ZIPs
@@ -488,20 +495,17 @@ class StudyUploader:
             logger.info(f"Creating chunk {chunk_idx}/{total_chunks} with {len(series_uids)} scans...")
 
             file_count = 0
+            # Files were grouped by series once, so none is read again here
             with zipfile.ZipFile(chunk_zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for dcm_file in extract_dir.rglob('*.dcm'):
-                    try:
-                        from pydicom import dcmread
-                        ds = dcmread(str(dcm_file), stop_before_pixels=True)
-                        series_uid = getattr(ds, 'SeriesInstanceUID', None)
-
-                        if series_uid in series_uids:
-                            arcname = dcm_file.relative_to(extract_dir)
+                for series_uid in series_uids:
+                    for dcm_file in scans.get(series_uid, []):
+                        try:
+                            arcname = os.path.relpath(dcm_file, extract_dir)
                             zipf.write(dcm_file, arcname)
                             file_count += 1
 
-                    except Exception as e:
-                        logger.warning(f"Error adding {dcm_file.name} to chunk: {e}")
+                        except Exception as e:
+                            logger.warning(f"Error adding {os.path.basename(dcm_file)} to chunk: {e}")
 
             chunk_size = chunk_zip_path.stat().st_size
             logger.info(f"Chunk {chunk_idx}: {file_count} files, {chunk_size / 1024 / 1024:.2f} MB")
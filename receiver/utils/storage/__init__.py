@@ -4,7 +4,11 @@ Storage Utilities - Data Persistence Helpers
 Instance metadata management and storage utilities.
 """
 from .instance_metadata import InstanceMetadataHandler
+from .dicom_files import find_dicom_files
+from .zip_inflate import open_zip_member
 
 __all__ = [
     'InstanceMetadataHandler',
+    'find_dicom_files',
+    'open_zip_member',
 ]
@@ -0,0 +1,37 @@
+"""
+DICOM File Discovery
+Lists DICOM files below a directory without pathlib glob overhead.
+"""
+import os
+from pathlib import Path
+from typing import List, Union
+
+
+def find_dicom_files(directory: Union[str, Path], recursive: bool = True) -> List[str]:
+    """
+    Find all .dcm files below a directory.
+
+    Walks the tree with an os.scandir stack and returns plain string
+    paths, avoiding the Path object per entry and extra stat calls of
+    Path.rglob. The strings can be passed straight to dcmread.
+
+    Args:
+        directory: Directory to search
+        recursive: Also search subdirectories
+
+    Returns:
+        List of DICOM file paths
+    """
+    dcm_files = []
+    pending = [os.fspath(directory)]
+
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                elif entry.name.endswith('.dcm'):
+                    dcm_files.append(entry.path)
+
+    return dcm_files
@@ -4,8 +4,9 @@ Manages instance metadata in XML format for efficient storage and retrieval.
 Avoids database bloat by storing instance metadata in XML files per series.
 """
 import xml.etree.ElementTree as ET
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import threading
 from datetime import datetime
 
@@ -14,10 +15,18 @@ class InstanceMetadataHandler:
     """
     Handles reading and writing instance metadata to XML files.
     Thread-safe operations for concurrent access.
+
+    Parsed trees are cached per file and reused while the file's mtime and
+    size are unchanged, so storing an instance and then counting does not
+    re-parse the whole series file each time.
     """
 
+    # Number of series files whose parsed tree is kept in memory
+    TREE_CACHE_SIZE = 64
+
     def __init__(self):
         self._lock = threading.Lock()
+        self._trees: 'OrderedDict[str, Tuple[Tuple[int, int], ET.ElementTree]]' = OrderedDict()
 
     def add_instance(
         self,
@@ -44,8 +53,8 @@ class InstanceMetadataHandler:
         """
         with self._lock:
             try:
-                if xml_path.exists():
-                    tree = ET.parse(xml_path)
+                tree = self._load_tree(xml_path)
+                if tree is not None:
                     root = tree.getroot()
                 else:
                     root = ET.Element('instances')
@@ -73,6 +82,8 @@ class InstanceMetadataHandler:
                 return True
 
             except Exception as e:
+                # The cached tree may hold changes that never reached disk
+                self._trees.pop(str(xml_path), None)
                 import logging
                 logging.getLogger(__name__).error(f"Error adding instance to XML: {e}", exc_info=True)
                 return False
@@ -89,10 +100,10 @@ class InstanceMetadataHandler:
         """
         with self._lock:
             try:
-                if not xml_path.exists():
+                tree = self._load_tree(xml_path)
+                if tree is None:
                     return []
 
-                tree = ET.parse(xml_path)
                 root = tree.getroot()
 
                 instances = []
@@ -153,16 +164,16 @@ class InstanceMetadataHandler:
         Returns:
             Number of instances
         """
-        try:
-            if not xml_path.exists():
-                return 0
+        with self._lock:
+            try:
+                tree = self._load_tree(xml_path)
+                if tree is None:
+                    return 0
 
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
-            return len(root.findall('instance'))
+                return len(tree.getroot().findall('instance'))
 
-        except Exception:
-            return 0
+            except Exception:
+                return 0
 
     def remove_instance(self, xml_path: Path, sop_instance_uid: str) -> bool:
         """
@@ -177,10 +188,10 @@ class InstanceMetadataHandler:
         """
         with self._lock:
             try:
-                if not xml_path.exists():
+                tree = self._load_tree(xml_path)
+                if tree is None:
                     return False
 
-                tree = ET.parse(xml_path)
                 root = tree.getroot()
 
                 for instance in root.findall('instance'):
@@ -192,6 +203,7 @@ class InstanceMetadataHandler:
                 return False
 
             except Exception as e:
+                self._trees.pop(str(xml_path), None)
                 import logging
                 logging.getLogger(__name__).error(f"Error removing instance from XML: {e}", exc_info=True)
                 return False
@@ -209,6 +221,53 @@ class InstanceMetadataHandler:
         self._indent(tree.getroot())
 
         tree.write(xml_path, encoding='utf-8', xml_declaration=True)
+        self._cache_tree(xml_path, tree)
+
+    def _load_tree(self, xml_path: Path) -> Optional[ET.ElementTree]:
+        """
+        Parse an XML file, reusing the cached tree if the file is unchanged.
+
+        Must be called with the lock held.
+
+        Args:
+            xml_path: Path to instances.xml file
+
+        Returns:
+            ElementTree, or None if the file does not exist
+        """
+        key = str(xml_path)
+        try:
+            st = xml_path.stat()
+        except FileNotFoundError:
+            self._trees.pop(key, None)
+            return None
+
+        cached = self._trees.get(key)
+        if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size):
+            self._trees.move_to_end(key)
+            return cached[1]
+
+        tree = ET.parse(xml_path)
+        self._cache_tree(xml_path, tree, st)
+        return tree
+
+    def _cache_tree(self, xml_path: Path, tree: ET.ElementTree, st=None):
+        """
+        Remember a tree as the current contents of an XML file.
+
+        Args:
+            xml_path: Path the tree was read from or written to
+            tree: ElementTree object
+            st: os.stat_result of the file, taken now if not given
+        """
+        if st is None:
+            st = xml_path.stat()
+
+        key = str(xml_path)
+        self._trees[key] = ((st.st_mtime_ns, st.st_size), tree)
+        self._trees.move_to_end(key)
+        while len(self._trees) > self.TREE_CACHE_SIZE:
+            self._trees.popitem(last=False)
 
     def _indent(self, elem, level=0):
         """
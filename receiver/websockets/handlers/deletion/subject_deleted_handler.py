@@ -98,11 +98,13 @@ class SubjectDeletedHandler(BaseEventHandler):
         @sync_to_async
         def _delete():
             sessions = Session.objects.filter(patient_id=anonymous_patient_id)
-            count = sessions.count()
 
-            # Delete each session (triggers custom delete() method with cleanup)
+            # Delete each session (triggers custom delete() method with cleanup),
+            # counting as we go rather than issuing a separate COUNT query
+            count = 0
             for session in sessions:
                 session.delete()
+                count += 1
 
             return count
 
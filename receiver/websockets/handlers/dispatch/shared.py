@@ -8,10 +8,12 @@ Common functionality used by subject/session/scan dispatch handlers:
 - Status reporting
 - PHI resolution
 """
+import os
 from typing import List
 from pathlib import Path
 from receiver.services.api import IthAPIClient
 from receiver.utils.config import NodeConfig
+from receiver.utils.storage import find_dicom_files
 
 
 async def get_matching_nodes(requested_node_ids: List[str]) -> List[NodeConfig]:
@@ -205,14 +207,15 @@ async def resolve_phi_in_directory(dicom_dir: Path, logger, subject_id: str = No
         from receiver.containers import container
 
         resolver = container.phi_resolver()
+        phi_cache = {}
         resolved_count = 0
         first_patient_info = None
 
         for dcm_file in files_batch:
             try:
-                ds = dcmread(str(dcm_file))
-                ds = resolver.resolve_dataset(ds)
-                ds.save_as(str(dcm_file))
+                ds = dcmread(dcm_file)
+                ds = resolver.resolve_dataset(ds, cache=phi_cache)
+                ds.save_as(dcm_file)
                 resolved_count += 1
 
                 if resolved_count == 1:
@@ -221,12 +224,12 @@ async def resolve_phi_in_directory(dicom_dir: Path, logger, subject_id: str = No
                     first_patient_info = (patient_name, patient_id)
 
             except Exception as e:
-                logger.warning(f"Failed to resolve PHI for {dcm_file.name}: {e}")
+                logger.warning(f"Failed to resolve PHI for {os.path.basename(dcm_file)}: {e}")
 
         return resolved_count, first_patient_info
 
     # Get all DICOM files
-    dcm_files = list(dicom_dir.rglob('*.dcm'))
+    dcm_files = find_dicom_files(dicom_dir)
 
     if not dcm_files:
         logger.warning(f"No DICOM files found in {dicom_dir}")